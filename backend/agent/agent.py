@@ -47,7 +47,7 @@ def ag(user_message, user_id):
 
         
         Tool.from_function(func=calculate_monthly_taxes, name="calculate_monthly_taxes",
-            description="Calculates monthly taxes for a user. Returns a list of 12 tax amounts. Requires: user_id (integer)."),
+            description="Calculates monthly taxes for a user. Returns a list of 12 dictionaries with 'month' and 'tax'. Requires: user_id (integer)."),
         Tool.from_function(func=calculate_monthly_sales, name="calculate_monthly_sales",
             description="Calculates monthly sales for a user. Returns a list of dictionaries with 'month' and 'sales'. Requires: user_id (integer)."),
         Tool.from_function(func=calculate_monthly_profit_loss, name="calculate_monthly_profit_loss",
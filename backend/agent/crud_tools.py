@@ -3,13 +3,10 @@ from models.products import Product
 from models.sale import Sale   
 from models.tax import Tax  
 
-from datetime import datetime, timedelta
 from langchain.tools import tool
-from datetime import datetime
 from typing import Dict, List, Union
-import pandas as pd
-from sqlalchemy import extract, func
-from extensions import db
+from analytics.periods import week_period
+from analytics import service as analytics
 
 # @tool
 # def calculate_taxes_for_user(args: str) -> Dict[str, Union[int, float]]:
@@ -217,19 +214,13 @@ def calculate_profit_loss(user_id: int) -> Dict[str, Union[int, float]]:
     if user_id <= 0:
         raise ValueError("user_id must be a positive integer.")
 
-    sales = Sale.query.filter_by(user_id=user_id).all()
-    expenses = Expense.query.filter_by(user_id=user_id).all()
-
-    total_sales = sum(sale.quantity * sale.sale_price for sale in sales)
-    total_expenses = sum(expense.amount for expense in expenses)
-
-    profit_loss = total_sales - total_expenses
+    totals = analytics.totals(user_id, ('sales', 'expenses', 'profit_loss'))
 
     return {
         'user_id': user_id,
-        'total_sales': total_sales,
-        'total_expenses': total_expenses,
-        'profit_loss': profit_loss,
+        'total_sales': totals['sales'],
+        'total_expenses': totals['expenses'],
+        'profit_loss': totals['profit_loss'],
     }
 
 # @tool
@@ -305,23 +296,16 @@ def get_weekly_sales(user_id: int) -> Dict[str, Union[int, str, float]]:
     if user_id <= 0:
         raise ValueError("user_id must be a positive integer.")
 
-    today = datetime.now().date()
-    start_of_week = today - timedelta(days=today.weekday())
-    end_of_week = start_of_week + timedelta(days=6)
-
-    sales = Sale.query.filter(
-        Sale.user_id == user_id,
-        func.date(Sale.sale_date) >= start_of_week,
-        func.date(Sale.sale_date) <= end_of_week
-    ).all()
+    week = week_period()
+    sales = analytics.totals(user_id, ('sales', 'sale_count'), week)
 
-    total_sales = sum(sale.quantity * sale.sale_price for sale in sales)
-    sale_count = len(sales)
+    total_sales = sales['sales']
+    sale_count = sales['sale_count']
 
     return {
         'user_id': user_id,
-        'start_of_week': start_of_week.isoformat(),
-        'end_of_week': end_of_week.isoformat(),
+        'start_of_week': week.start_day.isoformat(),
+        'end_of_week': week.last_day.isoformat(),
         'total_sales': total_sales,
         'sale_count': sale_count
     }
@@ -392,30 +376,17 @@ def get_weekly_profit_loss(user_id: int) -> Dict[str, Union[int, str, float]]:
     if user_id <= 0:
         raise ValueError("user_id must be a positive integer.")
 
-    today = datetime.now().date()
-    start_of_week = today - timedelta(days=today.weekday())
-    end_of_week = start_of_week + timedelta(days=6)
-
-    sales = Sale.query.filter(
-        Sale.user_id == user_id,
-        func.date(Sale.sale_date) >= start_of_week,
-        func.date(Sale.sale_date) <= end_of_week
-    ).all()
-
-    expenses = Expense.query.filter(
-        Expense.user_id == user_id,
-        func.date(Expense.date) >= start_of_week,
-        func.date(Expense.date) <= end_of_week
-    ).all()
+    week = week_period()
+    totals = analytics.totals(user_id, ('sales', 'expenses', 'profit_loss'), week)
 
-    total_sales = sum(sale.quantity * sale.sale_price for sale in sales)
-    total_expenses = sum(expense.amount for expense in expenses)
-    profit_loss = total_sales - total_expenses
+    total_sales = totals['sales']
+    total_expenses = totals['expenses']
+    profit_loss = totals['profit_loss']
 
     return {
         'user_id': user_id,
-        'start_of_week': start_of_week.isoformat(),
-        'end_of_week': end_of_week.isoformat(),
+        'start_of_week': week.start_day.isoformat(),
+        'end_of_week': week.last_day.isoformat(),
         'total_sales': total_sales,
         'total_expenses': total_expenses,
         'profit_loss': profit_loss
@@ -473,7 +444,7 @@ def get_weekly_profit_loss(user_id: int) -> Dict[str, Union[int, str, float]]:
 @tool
 def analyze_sales_performance_orm() -> Dict:
     """
-    Analyzes sales data to identify top and bottom-performing products using SQLAlchemy ORM.
+    Identifies the top and bottom-performing products by revenue.
 
     Returns:
          A dictionary containing two lists:
@@ -481,31 +452,7 @@ def analyze_sales_performance_orm() -> Dict:
             - bottom_products: List of dictionaries representing bottom-performing products.
     """
     try:
-        # ORM query to join products and sales tables and calculate total sales per product
-        results = db.session.query(
-            Product.product_name,
-            db.func.sum(Sale.sale_price).label('total_sales')
-        ).join(Sale, Product.id == Sale.product_id).group_by(Product.product_name).order_by(
-            db.func.sum(Sale.sale_price).desc()).all()
-
-        # Convert the results to a pandas DataFrame
-        df = pd.DataFrame(results, columns=['product_name', 'total_sales'])
-
-        # Calculate the number of products to include in top and bottom lists (e.g., top 5 and bottom 5)
-        num_products = min(5, len(df))  # Ensure we don't try to slice beyond the DataFrame size
-
-        # Identify top-performing products
-        top_products = df.head(num_products).to_dict(orient='records')
-
-        # Identify bottom-performing products
-        bottom_products = df.tail(num_products).to_dict(orient='records')
-
-        response = {
-            'top_products': top_products,
-            'bottom_products': bottom_products
-        }
-
-        return response
+        return analytics.top_and_bottom_products()
 
     except Exception as e:
         # Consider logging the error here for debugging purposes
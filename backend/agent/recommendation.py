@@ -2,30 +2,14 @@ from flask import Blueprint, jsonify, request
 import pandas as pd
 from sklearn.metrics.pairwise import cosine_similarity
 from sklearn.feature_extraction.text import TfidfVectorizer
-from models.products import Product  # Import your Product model
+from analytics.frames import products_frame
 
 recommendation_bp = Blueprint('recommendation', __name__)
 
 def fetch_products_data():
     """Fetches product data from the database and returns it as a Pandas DataFrame."""
     try:
-        # Fetch product data using traditional querying
-        products = Product.query.all()
-
-        # Convert product data to a list of dictionaries
-        products_data = [
-            {
-                'id': product.id,
-                'product_name': product.product_name,
-                'description': product.description,
-                'category': product.category
-            }
-            for product in products
-        ]
-
-        # Convert the list of dictionaries to a Pandas DataFrame
-        df = pd.DataFrame(products_data)
-        return df
+        return products_frame(('id', 'product_name', 'description', 'category'))
 
     except Exception as e:
         print(f"Error fetching product data: {e}")
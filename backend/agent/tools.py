@@ -3,12 +3,12 @@ from typing import List
 from flask import jsonify
 from langchain.tools import tool
 import requests
-from sqlalchemy import extract
 from models.sale import Sale
 from models.tax import Tax
 from models.users import User
 from models.products import Product
-from extensions import db
+from analytics import service as analytics
+from analytics.periods import year_period
 
 @tool
 def search_wikipedia(search_term: str):
@@ -104,10 +104,10 @@ def top_product_recommendations(user_id) -> List[int]:
     
 
 @tool
-def calculate_monthly_taxes(user_id: int) -> List[float]:
+def calculate_monthly_taxes(user_id: int) -> List[dict]:
     """
     Calculates monthly taxes for a given user for the current year.
-    Returns a list of 12 tax amounts (one for each month).
+    Returns a list of 12 dictionaries with 'month' and 'tax' keys.
     """
     if not isinstance(user_id, int):
         raise TypeError("user_id must be an integer.")
@@ -115,20 +115,9 @@ def calculate_monthly_taxes(user_id: int) -> List[float]:
         raise ValueError("user_id must be a positive integer.")
 
     current_year = datetime.now().year
-    monthly_taxes = []
+    months = analytics.series(user_id, ('sales',), 'month', year_period(current_year))
 
-    for month in range(1, 13):
-        sales = Sale.query.filter(
-            Sale.user_id == user_id,
-            extract('year', Sale.sale_date) == current_year,
-            extract('month', Sale.sale_date) == month
-        ).all()
-
-        total_sales = sum(sale.quantity * sale.sale_price for sale in sales)
-        monthly_tax = total_sales * 0.15   
-        monthly_taxes.append({month: monthly_tax})
-
-    return monthly_taxes
+    return [{'month': month, 'tax': totals['sales'] * 0.15} for month, totals in enumerate(months, start=1)]
 
 
 
@@ -146,19 +135,9 @@ def calculate_monthly_sales(user_id: int) -> List[dict]:
         raise ValueError("user_id must be a positive integer.")
     
     current_year = datetime.now().year
-    monthly_sales = []
-
-    for month in range(1, 13):
-        sales = Sale.query.filter(
-            Sale.user_id == user_id,
-            extract('year', Sale.sale_date) == current_year,
-            extract('month', Sale.sale_date) == month
-        ).all()
-
-        total_sales = sum(sale.quantity * sale.sale_price for sale in sales)
-        monthly_sales.append({ month, total_sales})
+    months = analytics.series(user_id, ('sales',), 'month', year_period(current_year))
 
-    return monthly_sales
+    return [{'month': month, 'sales': totals['sales']} for month, totals in enumerate(months, start=1)]
 
 # ...existing code...
 from models.expense import Expense
@@ -177,28 +156,9 @@ def calculate_monthly_profit_loss(user_id: int) -> List[dict]:
         raise ValueError("user_id must be a positive integer.")
     
     current_year = datetime.now().year
-    monthly_profit_loss = []
-
-    for month in range(1, 13):
-        sales = Sale.query.filter(
-            Sale.user_id == user_id,
-            extract('year', Sale.sale_date) == current_year,
-            extract('month', Sale.sale_date) == month
-        ).all()
-
-        expenses = Expense.query.filter(
-            Expense.user_id == user_id,
-            extract('year', Expense.date) == current_year,
-            extract('month', Expense.date) == month
-        ).all()
-
-        total_sales = sum(sale.quantity * sale.sale_price for sale in sales)
-        total_expenses = sum(expense.amount for expense in expenses)
-
-        profit_loss = total_sales - total_expenses
-        monthly_profit_loss.append({ month, profit_loss})
+    months = analytics.series(user_id, ('profit_loss',), 'month', year_period(current_year))
 
-    return monthly_profit_loss
+    return [{'month': month, 'profit_loss': totals['profit_loss']} for month, totals in enumerate(months, start=1)]
 
  
 from models.expense import Expense
@@ -207,37 +167,17 @@ from models.expense import Expense
 def calculate_weekly_profit_loss(user_id: int) -> List[dict]:
     """
     Calculates weekly profit or loss (total revenue minus total expenses)
-    for a given user for the current year.
-    Returns a list of dictionaries with 'week' and 'profit_loss' keys.
+    for a given user for every ISO week of the current year.
+    Returns a list of dictionaries with 'week', 'start_of_week', 'total_sales',
+    'total_expenses' and 'profit_loss' keys.
     """
     if not isinstance(user_id, int):
         raise TypeError("user_id must be an integer.")
     if user_id <= 0:
         raise ValueError("user_id must be a positive integer.")
 
-    current_year = datetime.now().year
-    weekly_profit_loss = []
-
-    for week in range(1, 53):  # 1 through 52 (some years may have 53 weeks)
-        sales = Sale.query.filter(
-            Sale.user_id == user_id,
-            extract('year', Sale.sale_date) == current_year,
-            extract('week', Sale.sale_date) == week
-        ).all()
-
-        expenses = Expense.query.filter(
-            Expense.user_id == user_id,
-            extract('year', Expense.date) == current_year,
-            extract('week', Expense.date) == week
-        ).all()
-
-        total_sales = sum(sale.quantity * sale.sale_price for sale in sales)
-        total_expenses = sum(expense.amount for expense in expenses)
-
-        profit_loss = total_sales - total_expenses
-        weekly_profit_loss.append({ week, profit_loss})
-
-    return weekly_profit_loss
+    current_year = datetime.now().isocalendar()[0]
+    return analytics.weekly_profit_loss_series(user_id, current_year)
 
 # ...existing code...
 
@@ -0,0 +1,159 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from datetime import date
+from functools import wraps
+
+from flask import current_app, make_response, request
+
+from analytics import versions
+
+
+class ResultCache:
+    """
+    A thread-safe, in-process LRU of rendered report responses, bounded by entry count and bytes.
+
+    Entries are never invalidated explicitly: the user's data version is part of every key, so
+    a write simply makes the old entries unreachable and LRU eviction reclaims them.
+    """
+
+    def __init__(self, max_entries=1024, max_bytes=32 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.max_entries = app.config.get('REPORT_CACHE_MAX_ENTRIES', self.max_entries)
+        self.max_bytes = app.config.get('REPORT_CACHE_MAX_BYTES', self.max_bytes)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key, body, status, mimetype):
+        size = len(body)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old[0])
+            self._entries[key] = (body, status, mimetype)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (evicted, _, _) = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+report_cache = ResultCache()
+
+
+def current_user_id():
+    """
+    The user the report and list views act for. They still use the placeholder user 1;
+    views and the cache/ETag key both call this, so a response is always keyed on the data
+    version of the user whose data it shows.
+    """
+    return 1
+
+
+def query_user_id():
+    """The user_id query parameter as an int, for the views that take one; None if missing or invalid."""
+    return request.args.get('user_id', type=int)
+
+
+def _request_key(kwargs, user):
+    """(user_id, endpoint, view args, query params, data version, today) for the current request."""
+    user_id = user()
+    return (
+        user_id,
+        request.endpoint,
+        tuple(sorted(kwargs.items())),
+        tuple(sorted(request.args.items(multi=True))),
+        versions.current(user_id) if user_id is not None else 0,
+        date.today(),
+    )
+
+
+def _etag(key):
+    return hashlib.sha1(repr(key).encode()).hexdigest()
+
+
+def _not_modified(etag):
+    return _tagged(current_app.response_class(status=304), etag)
+
+
+def _tagged(response, etag):
+    if response.status_code in (200, 304):
+        # Weak: the tag names a data version, not a byte sequence, and the compression
+        # middleware may re-encode a 200 body; a 304 must carry the same validator.
+        response.set_etag(etag, weak=True)
+        # Let clients keep the body but revalidate it on every use.
+        response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+def conditional_get(view=None, *, user=current_user_id):
+    """
+    Gives a view's responses a weak ETag derived from the user's data version and answers
+    a matching If-None-Match with 304 Not Modified before the view runs, so an unchanged
+    poll costs one primary-key lookup and no serialization.
+
+    `user` resolves the user the view queries and must be the same function the view uses:
+    `current_user_id` (the default) or `query_user_id`, as `@conditional_get(user=query_user_id)`.
+    """
+    if view is None:
+        return lambda view: conditional_get(view, user=user)
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        etag = _etag(_request_key(kwargs, user))
+        if request.if_none_match.contains_weak(etag):
+            return _not_modified(etag)
+        return _tagged(make_response(view(*args, **kwargs)), etag)
+
+    return wrapper
+
+
+def cached_report(view=None, *, user=current_user_id):
+    """
+    Serves a report view from `report_cache` when the user's data has not changed.
+
+    The key is (user_id, endpoint, query params, data version, today); today is included
+    because "current week"/"current year" reports move with the calendar, not with writes.
+    `user` resolves the user as in `conditional_get`. Only 200 responses are cached.
+    Responses also carry an ETag built from the same key, as in `conditional_get`, and a
+    matching If-None-Match gets a 304 without a cache lookup.
+    """
+    if view is None:
+        return lambda view: cached_report(view, user=user)
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        key = _request_key(kwargs, user)
+        etag = _etag(key)
+        if request.if_none_match.contains_weak(etag):
+            return _not_modified(etag)
+
+        enabled = current_app.config.get('REPORT_CACHE_ENABLED', True)
+        hit = report_cache.get(key) if enabled else None
+        if hit is not None:
+            body, status, mimetype = hit
+            return _tagged(current_app.response_class(body, status=status, mimetype=mimetype), etag)
+
+        response = make_response(view(*args, **kwargs))
+        if enabled and response.status_code == 200 and not response.is_streamed:
+            report_cache.put(key, response.get_data(), response.status_code, response.mimetype)
+        return _tagged(response, etag)
+
+    return wrapper
@@ -0,0 +1,118 @@
+"""
+Vectorised per-product sales forecasting.
+
+One grouped query builds a product x day matrix of daily sales. Every product then gets
+the same linear model, a trend plus day-of-week seasonality:
+
+    y[p, d] = a[p] + b[p] * t[d] + sum_k s[p, k] * weekday_k[d]
+
+Because the design matrix is shared by all products, a single `np.linalg.lstsq` call fits
+every product at once (one right-hand side per product), and the prediction intervals
+come from the same shared leverage terms. A catalog of thousands of products is a few
+matrix products rather than thousands of separate fits.
+"""
+from datetime import date, timedelta
+from statistics import NormalDist
+
+import numpy as np
+from sqlalchemy import func
+
+from extensions import db
+from models.sale import Sale
+from analytics.periods import date_range_period
+
+FORECAST_METRICS = ('sales', 'units')
+MIN_HISTORY_DAYS = 14
+MAX_HISTORY_DAYS = 730  # bounds the products x days matrix
+MAX_HORIZON = 365
+
+
+def daily_matrix(user_id, start_day, end_day, metric='sales'):
+    """
+    (product_ids, matrix) where matrix[p, d] is product_ids[p]'s sales (revenue, or units
+    for metric='units') on start_day + d, for every day in [start_day, end_day). Products
+    with no sales in the window are left out.
+    """
+    amount = Sale.quantity * Sale.sale_price if metric == 'sales' else Sale.quantity
+    period = date_range_period(start_day, end_day - timedelta(days=1))
+    day = func.date(Sale.sale_date)
+    rows = db.session.query(Sale.product_id, day, func.sum(amount)).filter(
+        Sale.user_id == user_id, Sale.sale_date >= period.start, Sale.sale_date < period.end
+    ).group_by(Sale.product_id, day).all()
+
+    days = (end_day - start_day).days
+    if not rows:
+        return np.empty(0, dtype=np.int64), np.zeros((0, days))
+
+    product_column, day_column, totals = zip(*rows)
+    product_ids, product_index = np.unique(np.array(product_column, dtype=np.int64), return_inverse=True)
+    day_index = np.array([(date.fromisoformat(value) - start_day).days for value in day_column])
+
+    matrix = np.zeros((len(product_ids), days))
+    matrix[product_index, day_index] = np.asarray(totals, dtype=np.float64)
+    return product_ids, matrix
+
+
+def design_matrix(start_day, days, origin):
+    """Rows [1, t, Tue, Wed, Thu, Fri, Sat, Sun] for `days` consecutive days; t counts from `origin`."""
+    offsets = np.arange(days) + (start_day - origin).days
+    weekdays = (start_day.weekday() + np.arange(days)) % 7
+    seasonal = (weekdays[:, None] == np.arange(1, 7)[None, :]).astype(np.float64)  # Monday is the baseline
+    return np.column_stack([np.ones(days), offsets.astype(np.float64), seasonal])
+
+
+def forecast_products(user_id, horizon=30, history_days=180, level=0.95, metric='sales', today=None):
+    """
+    Forecasts daily sales for each of the user's products that sold in the last
+    `history_days` days.
+
+    Returns {'dates': [...], 'products': [{'product_id', 'predicted', 'lower', 'upper'}]},
+    where the three lists run parallel to 'dates' and [lower, upper] is the `level` prediction
+    interval. Values are clipped at 0. Raises ValueError for bad parameters.
+    """
+    if metric not in FORECAST_METRICS:
+        raise ValueError(f"Unknown metric. Use any of {', '.join(FORECAST_METRICS)}.")
+    if not 0 < level < 1:
+        raise ValueError("level must be between 0 and 1.")
+    if not 1 <= horizon <= MAX_HORIZON:
+        raise ValueError(f"days must be between 1 and {MAX_HORIZON}.")
+    if not MIN_HISTORY_DAYS <= history_days <= MAX_HISTORY_DAYS:
+        raise ValueError(f"history must be between {MIN_HISTORY_DAYS} and {MAX_HISTORY_DAYS} days.")
+
+    today = today or date.today()
+    start_day = today - timedelta(days=history_days)  # history ends yesterday; today is still partial
+    dates = [(today + timedelta(days=i)).isoformat() for i in range(horizon)]
+
+    product_ids, matrix = daily_matrix(user_id, start_day, today, metric)
+    if not len(product_ids):
+        return {'dates': dates, 'products': []}
+
+    X = design_matrix(start_day, history_days, start_day)
+    coefficients, _, rank, _ = np.linalg.lstsq(X, matrix.T, rcond=None)  # (features, products)
+    residuals = matrix.T - X @ coefficients
+    dof = max(history_days - rank, 1)
+    sigma = np.sqrt((residuals ** 2).sum(axis=0) / dof)  # (products,)
+
+    future = design_matrix(today, horizon, start_day)
+    predicted = future @ coefficients  # (horizon, products)
+    # Prediction-interval widths: the leverage term depends only on the shared design.
+    leverage = np.einsum('ij,jk,ik->i', future, np.linalg.pinv(X.T @ X), future)
+    z = NormalDist().inv_cdf((1 + level) / 2)
+    half_width = z * np.sqrt(1 + leverage)[:, None] * sigma[None, :]
+
+    lower = np.clip(predicted - half_width, 0, None)
+    upper = np.clip(predicted + half_width, 0, None)
+    predicted = np.clip(predicted, 0, None)
+
+    return {
+        'dates': dates,
+        'products': [
+            {
+                'product_id': int(product_id),
+                'predicted': np.round(predicted[:, p], 2).tolist(),
+                'lower': np.round(lower[:, p], 2).tolist(),
+                'upper': np.round(upper[:, p], 2).tolist(),
+            }
+            for p, product_id in enumerate(product_ids)
+        ],
+    }
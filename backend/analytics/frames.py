@@ -0,0 +1,79 @@
+"""
+Column-projected loaders that read sales and products straight into typed DataFrames.
+
+The query runs through `pd.read_sql`, so rows go from the cursor into columns without
+ORM objects or intermediate dicts. Integer ids and counts are downcast to int32 and
+repeated strings (product names, categories) become categoricals, which keeps analytics
+requests small in memory. Amounts stay float64 so totals do not drift.
+"""
+import pandas as pd
+
+from extensions import db
+from models.products import Product
+from models.sale import Sale
+
+SALE_COLUMNS = {
+    'id': (Sale.id, 'int32'),
+    'product_id': (Sale.product_id, 'int32'),
+    'quantity': (Sale.quantity, 'int32'),
+    'sale_date': (Sale.sale_date, None),
+    'sale_price': (Sale.sale_price, 'float64'),
+    'user_id': (Sale.user_id, 'int32'),
+    'product_name': (Product.product_name, 'category'),
+}
+
+PRODUCT_COLUMNS = {
+    'id': (Product.id, 'int32'),
+    'product_name': (Product.product_name, 'category'),
+    'description': (Product.description, 'object'),
+    'initial_stock': (Product.initial_stock, 'int32'),
+    'price': (Product.price, 'float64'),
+    'category': (Product.category, 'category'),
+    'sku': (Product.sku, 'object'),
+    'user_id': (Product.user_id, 'int32'),
+}
+
+
+def _check(spec, columns):
+    unknown = set(columns) - set(spec)
+    if unknown:
+        raise ValueError(f"Unknown column(s): {', '.join(sorted(unknown))}")
+
+
+def _read(query, spec, columns, parse_dates=()):
+    dtypes = {name: spec[name][1] for name in columns if spec[name][1] is not None}
+    return pd.read_sql(
+        query.statement,
+        db.session.connection(),
+        dtype=dtypes,
+        parse_dates=[name for name in parse_dates if name in columns],
+    )
+
+
+def sales_frame(columns=('product_id', 'quantity', 'sale_date', 'sale_price'), user_id=None, period=None,
+                product_id=None):
+    """
+    Sales as a DataFrame with the given `columns` (any of SALE_COLUMNS; 'product_name' joins
+    the product). Filters by user and product when `user_id` / `product_id` are given and by
+    a half-open `Period` on sale_date when `period` is given.
+    """
+    _check(SALE_COLUMNS, columns)
+    query = db.session.query(*(SALE_COLUMNS[name][0].label(name) for name in columns))
+    if 'product_name' in columns:
+        query = query.join(Product, Sale.product_id == Product.id)
+    if user_id is not None:
+        query = query.filter(Sale.user_id == user_id)
+    if product_id is not None:
+        query = query.filter(Sale.product_id == product_id)
+    if period is not None:
+        query = query.filter(Sale.sale_date >= period.start, Sale.sale_date < period.end)
+    return _read(query, SALE_COLUMNS, columns, parse_dates=('sale_date',))
+
+
+def products_frame(columns=('id', 'product_name', 'initial_stock'), user_id=None):
+    """Products as a DataFrame with the given `columns` (any of PRODUCT_COLUMNS), optionally for one user."""
+    _check(PRODUCT_COLUMNS, columns)
+    query = db.session.query(*(PRODUCT_COLUMNS[name][0].label(name) for name in columns))
+    if user_id is not None:
+        query = query.filter(Product.user_id == user_id)
+    return _read(query, PRODUCT_COLUMNS, columns)
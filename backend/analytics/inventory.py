@@ -0,0 +1,84 @@
+"""
+Stock-out projections from current stock and recent sales velocity.
+
+`Product.initial_stock` is decremented as sales are recorded, so it is the stock on hand.
+One grouped query sums the units each product sold over a trailing window; dividing by
+the window length gives a daily velocity, and the days of cover, stock-out dates and
+reorder points for the whole catalog follow from array arithmetic on those two columns.
+"""
+from datetime import date, timedelta
+
+import numpy as np
+from sqlalchemy import func
+
+from extensions import db
+from models.sale import Sale
+from analytics.frames import products_frame
+from analytics.periods import date_range_period
+
+MAX_WINDOW_DAYS = 365
+MAX_LEAD_TIME_DAYS = 365
+MAX_COVER_DAYS = 3650  # further out than this, a stock-out date is not a meaningful projection
+
+
+def units_sold(user_id, start_day, end_day):
+    """{product_id: units} sold by the user on days in [start_day, end_day)."""
+    period = date_range_period(start_day, end_day - timedelta(days=1))
+    return dict(db.session.query(Sale.product_id, func.sum(Sale.quantity)).filter(
+        Sale.user_id == user_id, Sale.sale_date >= period.start, Sale.sale_date < period.end
+    ).group_by(Sale.product_id).all())
+
+
+def stock_outlook(user_id, window_days=28, lead_time_days=7, safety_days=0, today=None):
+    """
+    Projected stock-out for each of the user's products.
+
+    Velocity is units sold per day over the last `window_days` full days. A product needs
+    reordering when its stock is at or below the reorder point, velocity x (lead time +
+    safety days), i.e. it would run out before a new order placed today arrives; products
+    already out of stock always do. Products with stock but no recent sales have no
+    stock-out date, nor do products whose stock would last more than MAX_COVER_DAYS.
+    Sorted by days of cover, soonest first.
+    Raises ValueError for bad parameters.
+    """
+    if not 1 <= window_days <= MAX_WINDOW_DAYS:
+        raise ValueError(f"window must be between 1 and {MAX_WINDOW_DAYS} days.")
+    if not 0 <= lead_time_days <= MAX_LEAD_TIME_DAYS:
+        raise ValueError(f"lead_time must be between 0 and {MAX_LEAD_TIME_DAYS} days.")
+    if not 0 <= safety_days <= MAX_LEAD_TIME_DAYS:
+        raise ValueError(f"safety_days must be between 0 and {MAX_LEAD_TIME_DAYS} days.")
+
+    today = today or date.today()
+    products = products_frame(('id', 'product_name', 'initial_stock'), user_id=user_id)
+    if products.empty:
+        return []
+
+    sold = units_sold(user_id, today - timedelta(days=window_days), today)
+    units = products['id'].map(sold).fillna(0).to_numpy(dtype=np.float64)
+    stock = np.clip(products['initial_stock'].to_numpy(dtype=np.float64), 0, None)
+
+    velocity = units / window_days
+    with np.errstate(divide='ignore', invalid='ignore'):
+        days_of_cover = np.where(stock <= 0, 0.0, np.where(velocity > 0, stock / velocity, np.inf))
+    reorder_point = velocity * (lead_time_days + safety_days)
+    needs_reorder = stock <= reorder_point
+
+    order = np.argsort(days_of_cover, kind='stable')
+    ids = products['id'].to_numpy()
+    names = products['product_name'].astype(object).to_numpy()
+    outlook = []
+    for i in order:
+        projected = days_of_cover[i] <= MAX_COVER_DAYS
+        outlook.append({
+            'product_id': int(ids[i]),
+            'product_name': names[i],
+            'stock': int(stock[i]),
+            'units_sold': int(units[i]),
+            'daily_velocity': round(float(velocity[i]), 3),
+            'days_of_cover': round(float(days_of_cover[i]), 1) if projected else None,
+            # Counting today as day 0, the last unit goes on day floor(cover).
+            'stockout_date': (today + timedelta(days=int(days_of_cover[i]))).isoformat() if projected else None,
+            'reorder_point': int(np.ceil(reorder_point[i])),
+            'needs_reorder': bool(needs_reorder[i]),
+        })
+    return outlook
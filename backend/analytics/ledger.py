@@ -0,0 +1,190 @@
+"""
+Columnar, in-memory per-user ledgers for arbitrary date-range totals.
+
+Each active user gets two sorted NumPy arrays per table (timestamps and running totals of
+the amounts). A [start, end) total is then two `searchsorted` lookups and a subtraction,
+whatever the number of rows in the range. Ledgers are built lazily from the database,
+appended to as new sales/expenses are committed, and evicted LRU under a byte budget.
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from analytics import versions
+from extensions import db
+from models.expense import Expense
+from models.sale import Sale
+
+REBUILD_ATTEMPTS = 3
+
+
+class Column:
+    """Sorted timestamps plus a prefix sum of their amounts, with amortised O(1) appends."""
+
+    def __init__(self, timestamps, amounts):
+        timestamps = np.asarray(timestamps, dtype='datetime64[us]')
+        amounts = np.asarray(amounts, dtype=np.float64)
+        order = np.argsort(timestamps, kind='stable')
+
+        self.size = len(timestamps)
+        capacity = max(16, self.size)
+        self._times = np.empty(capacity, dtype='datetime64[us]')
+        self._times[:self.size] = timestamps[order]
+        # _cumsum[i] is the sum of the first i amounts, so it has one more slot than _times.
+        self._cumsum = np.zeros(capacity + 1, dtype=np.float64)
+        np.cumsum(amounts[order], out=self._cumsum[1:self.size + 1])
+
+    @property
+    def nbytes(self):
+        return self._times.nbytes + self._cumsum.nbytes
+
+    def total(self, start, end):
+        """Sum of the amounts with start <= timestamp < end."""
+        times = self._times[:self.size]
+        i = np.searchsorted(times, np.datetime64(start, 'us'), side='left')
+        j = np.searchsorted(times, np.datetime64(end, 'us'), side='left')
+        return float(self._cumsum[j] - self._cumsum[i])
+
+    def extend(self, timestamps, amounts):
+        timestamps = np.asarray(timestamps, dtype='datetime64[us]')
+        amounts = np.asarray(amounts, dtype=np.float64)
+        if not len(timestamps):
+            return
+        if self.size and timestamps.min() < self._times[self.size - 1]:
+            # Back-dated entries: merge them in and rebuild the prefix sums once (rare, O(n)).
+            self.__init__(
+                np.concatenate([self._times[:self.size], timestamps]),
+                np.concatenate([np.diff(self._cumsum[:self.size + 1]), amounts]),
+            )
+            return
+
+        order = np.argsort(timestamps, kind='stable')
+        end = self.size + len(timestamps)
+        if end > len(self._times):
+            capacity = max(2 * len(self._times), end)
+            self._times = np.resize(self._times, capacity)
+            self._cumsum = np.resize(self._cumsum, capacity + 1)
+        self._times[self.size:end] = timestamps[order]
+        self._cumsum[self.size + 1:end + 1] = self._cumsum[self.size] + np.cumsum(amounts[order])
+        self.size = end
+
+
+class UserLedger:
+    def __init__(self, user_id, version):
+        self.user_id = user_id
+        self.version = version
+
+        sales = db.session.query(Sale.sale_date, Sale.quantity * Sale.sale_price).filter(
+            Sale.user_id == user_id).order_by(Sale.sale_date).all()
+        expenses = db.session.query(Expense.date, Expense.amount).filter(
+            Expense.user_id == user_id).order_by(Expense.date).all()
+
+        self.sales = Column([row[0] for row in sales], [row[1] for row in sales])
+        self.expenses = Column([row[0] for row in expenses], [row[1] for row in expenses])
+
+    @property
+    def nbytes(self):
+        return self.sales.nbytes + self.expenses.nbytes
+
+    def totals(self, period):
+        total_sales = self.sales.total(period.start, period.end)
+        total_expenses = self.expenses.total(period.start, period.end)
+        return {
+            'sales': total_sales,
+            'expenses': total_expenses,
+            'profit_loss': total_sales - total_expenses,
+        }
+
+
+class LedgerStore:
+    """LRU of `UserLedger`s bounded by the bytes their arrays hold."""
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._ledgers = OrderedDict()
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.max_bytes = app.config.get('LEDGER_MAX_BYTES', self.max_bytes)
+
+    def get(self, user_id):
+        """The user's ledger, rebuilt from the database if missing or behind their data version."""
+        version = versions.current(user_id)
+        with self._lock:
+            ledger = self._ledgers.get(user_id)
+            if ledger is not None and ledger.version == version:
+                self._ledgers.move_to_end(user_id)
+                return ledger
+
+        for _ in range(REBUILD_ATTEMPTS):
+            ledger = UserLedger(user_id, version)
+            # A write that committed while the rows were loading may or may not be in them,
+            # and a ledger tagged with the older version would have it appended a second
+            # time. Every write bumps the version atomically with its rows, so an unchanged
+            # version after the load means the rows are exactly those of `version`.
+            latest = versions.current(user_id)
+            if latest == version:
+                break
+            version = latest
+        else:
+            return ledger  # still being written to; answer from this load but don't keep it
+
+        with self._lock:
+            self._ledgers[user_id] = ledger
+            self._ledgers.move_to_end(user_id)
+            self._evict()
+        return ledger
+
+    def totals(self, user_id, period):
+        """{'sales', 'expenses', 'profit_loss'} over the half-open datetime `period`."""
+        ledger = self.get(user_id)
+        with self._lock:  # appends may resize the arrays underneath a reader
+            return ledger.totals(period)
+
+    def record_sale(self, sale):
+        """Appends a just-committed sale to its user's ledger, if one is loaded."""
+        self._append(sale.user_id, 'sales', [sale.sale_date], [sale.quantity * sale.sale_price])
+
+    def record_sales(self, user_id, sales):
+        """
+        Appends a just-committed batch of the user's sales (mappings with sale_date, quantity
+        and sale_price) that was written under a single version bump.
+        """
+        self._append(
+            user_id, 'sales',
+            [sale['sale_date'] for sale in sales],
+            [sale['quantity'] * sale['sale_price'] for sale in sales],
+        )
+
+    def record_expense(self, expense):
+        """Appends a just-committed expense to its user's ledger, if one is loaded."""
+        self._append(expense.user_id, 'expenses', [expense.date], [expense.amount])
+
+    def _append(self, user_id, column, timestamps, amounts):
+        version = versions.current(user_id)
+        with self._lock:
+            ledger = self._ledgers.get(user_id)
+            if ledger is None:
+                return
+            # Only append if this commit is the sole change since the ledger was built;
+            # otherwise another writer got in between and the ledger must be rebuilt.
+            if ledger.version != version - 1:
+                del self._ledgers[user_id]
+                return
+            getattr(ledger, column).extend(timestamps, amounts)
+            ledger.version = version
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            self._ledgers.clear()
+
+    def _evict(self):
+        total = sum(ledger.nbytes for ledger in self._ledgers.values())
+        while total > self.max_bytes and len(self._ledgers) > 1:
+            _, evicted = self._ledgers.popitem(last=False)
+            total -= evicted.nbytes
+
+
+ledgers = LedgerStore()
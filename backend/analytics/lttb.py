@@ -0,0 +1,48 @@
+"""
+Largest-Triangle-Three-Buckets downsampling (Steinarsson, 2013).
+
+Keeps the first and last points and, from each of `threshold - 2` equal-width buckets in
+between, the point forming the largest triangle with the point kept from the previous
+bucket and the average of the next bucket. The result preserves peaks and troughs far
+better than striding or averaging, so a chart of a few hundred points looks like the full
+series.
+"""
+import numpy as np
+
+
+def lttb(x, y, threshold):
+    """
+    Returns the indices of the points to keep, ascending, to draw (x, y) with `threshold`
+    points. `x` must be sorted and numeric (e.g. day ordinals). When the series already has
+    `threshold` points or fewer, or threshold < 3, every index is returned.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    # Bucket i covers full-array indices [edges[i], edges[i + 1]); together the buckets
+    # cover the interior points 1 .. n-2. Since threshold < n each bucket is non-empty.
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    counts = np.diff(edges)
+    average_x = np.add.reduceat(x[1:-1], edges[:-1] - 1) / counts
+    average_y = np.add.reduceat(y[1:-1], edges[:-1] - 1) / counts
+    # The third vertex for bucket i is the next bucket's average (the last point for the last bucket).
+    next_x = np.append(average_x[1:], x[-1])
+    next_y = np.append(average_y[1:], y[-1])
+
+    keep = np.empty(threshold, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    # Each bucket depends on the point kept from the previous one, so buckets are walked in
+    # order; the candidates within a bucket are scored in one vectorised step.
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        areas = np.abs(
+            (x[a] - next_x[i]) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (next_y[i] - y[a])
+        )
+        a = start + int(np.argmax(areas))
+        keep[i + 1] = a
+    return keep
@@ -0,0 +1,124 @@
+from collections import namedtuple
+from datetime import date, datetime, time, timedelta
+
+
+class Period(namedtuple('Period', ['start', 'end'])):
+    """
+    A half-open [start, end) datetime range.
+
+    Filter with `column >= period.start` and `column < period.end` on the raw column so
+    the predicate stays sargable and SQLite can range-scan the (user_id, date) indexes,
+    instead of wrapping the column in func.date() or extract().
+    """
+    __slots__ = ()
+
+    @property
+    def start_day(self):
+        return self.start.date()
+
+    @property
+    def end_day(self):
+        """First day not covered by the period; the exclusive bound for day-keyed rollups."""
+        if self.end.time() == time.min:
+            return self.end.date()
+        return self.end.date() + timedelta(days=1)
+
+    @property
+    def last_day(self):
+        """Last day covered by the period, for inclusive display."""
+        return self.end_day - timedelta(days=1)
+
+    def contains(self, value):
+        return self.start <= value < self.end
+
+
+def _midnight(day):
+    return datetime.combine(day, time.min)
+
+
+def _midnight_after(day, days):
+    """Midnight `days` after `day`; ValueError rather than OverflowError past date.max."""
+    try:
+        return _midnight(day + timedelta(days=days))
+    except OverflowError:
+        raise ValueError(f"{day.isoformat()} is out of range.") from None
+
+
+def day_period(day):
+    return Period(_midnight(day), _midnight_after(day, 1))
+
+
+def week_period(day=None):
+    """The Monday-to-Sunday week containing `day` (today by default)."""
+    day = day or datetime.now().date()
+    monday = day - timedelta(days=day.weekday())
+    return Period(_midnight(monday), _midnight_after(monday, 7))
+
+
+def iso_week_period(year, week):
+    monday = date.fromisocalendar(year, week, 1)
+    return Period(_midnight(monday), _midnight_after(monday, 7))
+
+
+def month_period(year, month):
+    if not 1 <= month <= 12:
+        raise ValueError("month must be between 1 and 12.")
+    start = date(year, month, 1)
+    end = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+    return Period(_midnight(start), _midnight(end))
+
+
+def quarter_period(year, quarter):
+    if not 1 <= quarter <= 4:
+        raise ValueError("quarter must be between 1 and 4.")
+    first_month = 3 * (quarter - 1) + 1
+    return Period(month_period(year, first_month).start, month_period(year, first_month + 2).end)
+
+
+def year_period(year):
+    return Period(_midnight(date(year, 1, 1)), _midnight(date(year + 1, 1, 1)))
+
+
+def iso_year_period(year):
+    """Monday of ISO week 1 up to Monday of the next ISO year's week 1."""
+    return Period(_midnight(date.fromisocalendar(year, 1, 1)), _midnight(date.fromisocalendar(year + 1, 1, 1)))
+
+
+def date_range_period(start_date, end_date):
+    """
+    A custom range; both dates are inclusive, so the whole of `end_date` is covered.
+    Raises ValueError when `end_date` is date.max, which has no following midnight.
+    """
+    if isinstance(start_date, datetime):
+        start_date = start_date.date()
+    if isinstance(end_date, datetime):
+        end_date = end_date.date()
+    return Period(_midnight(start_date), _midnight_after(end_date, 1))
+
+
+def parse_period(granularity, label):
+    """
+    The period a label names at `granularity`: 'YYYY-MM-DD' (day), 'YYYY-Www' (ISO week),
+    'YYYY-MM' (month), 'YYYY-Qn' (quarter) or 'YYYY' (year). Raises ValueError otherwise.
+    """
+    label = label.strip().upper()
+    if granularity == 'day':
+        return day_period(date.fromisoformat(label))
+    if granularity == 'week':
+        year, separator, week = label.partition('-W')
+        if not separator:
+            raise ValueError(f"Invalid week: {label}. Use YYYY-Www.")
+        return iso_week_period(int(year), int(week))
+    if granularity == 'month':
+        year, separator, month = label.partition('-')
+        if not separator:
+            raise ValueError(f"Invalid month: {label}. Use YYYY-MM.")
+        return month_period(int(year), int(month))
+    if granularity == 'quarter':
+        year, separator, quarter = label.partition('-Q')
+        if not separator:
+            raise ValueError(f"Invalid quarter: {label}. Use YYYY-Qn.")
+        return quarter_period(int(year), int(quarter))
+    if granularity == 'year':
+        return year_period(int(label))
+    raise ValueError(f"Unknown granularity: {granularity}")
@@ -0,0 +1,47 @@
+"""
+EXPLAIN QUERY PLAN helpers for checking that report and list queries stay on their indexes.
+
+`capture_statements()` records the SQL a block of code actually sends to the database,
+so tests check the real queries of analytics/service.py and views/ rather than copies
+of them that can drift.
+"""
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from extensions import db
+
+INDEXED_ACCESS = ('USING INDEX', 'USING COVERING INDEX', 'USING INTEGER PRIMARY KEY', 'USING PRIMARY KEY')
+
+
+@contextmanager
+def capture_statements(engine=None):
+    """Yields a list that collects (statement, parameters) for every SELECT run inside the block."""
+    engine = engine or db.engine
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT'):
+            statements.append((statement, parameters))
+
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
+
+
+def explain(statement, parameters=()):
+    """Returns the SQLite EXPLAIN QUERY PLAN detail lines for a statement and its parameters."""
+    rows = db.session.connection().exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', parameters)
+    return [row[-1] for row in rows]
+
+
+def full_scans(plan):
+    """Returns the plan steps that read a whole table instead of searching an index."""
+    return [step for step in plan if step.startswith('SCAN ') and 'COVERING INDEX' not in step]
+
+
+def uses_index(plan):
+    """True if some step of the plan searches or covers an index."""
+    return any(access in step for step in plan for access in INDEXED_ACCESS)
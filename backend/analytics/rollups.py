@@ -0,0 +1,75 @@
+from collections import defaultdict
+from datetime import datetime
+
+from extensions import db
+from analytics import versions
+from models.rollup import DailySales, DailyExpense
+
+
+def _day(value):
+    """Returns the calendar day a sale/expense timestamp belongs to."""
+    if value is None:
+        value = datetime.now()
+    return value.date() if isinstance(value, datetime) else value
+
+
+def _sales_row(user_id, day):
+    row = db.session.get(DailySales, (user_id, day))
+    if row is None:
+        row = DailySales(user_id=user_id, day=day, revenue=0.0, units=0, sale_count=0)
+        db.session.add(row)
+    return row
+
+
+def _expense_row(user_id, day, category):
+    row = db.session.get(DailyExpense, (user_id, day, category))
+    if row is None:
+        row = DailyExpense(user_id=user_id, day=day, category=category, total=0.0, expense_count=0)
+        db.session.add(row)
+    return row
+
+
+def apply_sale(sale, sign=1):
+    """
+    Adds (sign=1) or removes (sign=-1) a sale from its daily rollup row.
+
+    Must be called in the same session as the sale write so both land in one commit.
+    It also bumps the user's data version, which invalidates their cached reports.
+    To update a sale, call it with -1 before changing the sale and with 1 afterwards.
+    """
+    row = _sales_row(sale.user_id, _day(sale.sale_date))
+    row.revenue += sign * sale.quantity * sale.sale_price
+    row.units += sign * sale.quantity
+    row.sale_count += sign
+    versions.bump(sale.user_id)
+
+
+def apply_sales(sales):
+    """
+    Adds a batch of new sales (mappings with user_id, sale_date, quantity and sale_price)
+    to the rollups, touching each (user, day) row once and bumping each user's version once.
+    """
+    days = defaultdict(lambda: [0.0, 0, 0])
+    for sale in sales:
+        day = days[(sale['user_id'], _day(sale['sale_date']))]
+        day[0] += sale['quantity'] * sale['sale_price']
+        day[1] += sale['quantity']
+        day[2] += 1
+
+    for (user_id, day), (revenue, units, sale_count) in days.items():
+        row = _sales_row(user_id, day)
+        row.revenue += revenue
+        row.units += units
+        row.sale_count += sale_count
+
+    for user_id in {user_id for user_id, _ in days}:
+        versions.bump(user_id)
+
+
+def apply_expense(expense, sign=1):
+    """Adds (sign=1) or removes (sign=-1) an expense from its daily rollup row."""
+    row = _expense_row(expense.user_id, _day(expense.date), expense.category or '')
+    row.total += sign * expense.amount
+    row.expense_count += sign
+    versions.bump(expense.user_id)
+
@@ -0,0 +1,253 @@
+"""
+The analytics query engine shared by the report blueprints and the agent tools.
+
+Every sales/expense total or time series should come from here rather than from
+ad-hoc queries: aggregation is pushed into SQL over the daily rollup tables, and this
+is the one place where caching and further rollups get added.
+"""
+from datetime import date, timedelta
+
+from sqlalchemy import and_, case, cast, func, or_
+
+from extensions import db
+from analytics.periods import iso_year_period
+from models.products import Product
+from models.rollup import DailySales, DailyExpense
+from models.sale import Sale
+
+SALES_METRICS = ('sales', 'units', 'sale_count')
+EXPENSE_METRICS = ('expenses',)
+DERIVED_METRICS = ('profit_loss',)
+METRICS = SALES_METRICS + EXPENSE_METRICS + DERIVED_METRICS
+GRANULARITIES = ('day', 'week', 'month', 'quarter', 'year')
+MAX_SERIES_BUCKETS = 10000  # about 27 years of days; bounds the buckets one request builds
+
+
+def _check_metrics(metrics):
+    unknown = set(metrics) - set(METRICS)
+    if unknown:
+        raise ValueError(f"Unknown metric(s): {', '.join(sorted(unknown))}. Use any of {', '.join(METRICS)}.")
+
+
+def _needs_sales(metrics):
+    return any(m in SALES_METRICS or m == 'profit_loss' for m in metrics)
+
+
+def _needs_expenses(metrics):
+    return any(m in EXPENSE_METRICS or m == 'profit_loss' for m in metrics)
+
+
+def _sales_columns():
+    return (
+        func.coalesce(func.sum(DailySales.revenue), 0.0),
+        func.coalesce(func.sum(DailySales.units), 0),
+        func.coalesce(func.sum(DailySales.sale_count), 0),
+    )
+
+
+def _in_period(query, day_column, period):
+    if period is None:
+        return query
+    return query.filter(day_column >= period.start_day, day_column < period.end_day)
+
+
+def _pick(values, metrics):
+    values['profit_loss'] = values['sales'] - values['expenses']
+    return {metric: values[metric] for metric in metrics}
+
+
+def totals(user_id, metrics=METRICS, period=None):
+    """
+    Returns {metric: value} for a user over a day-aligned `Period` (all time when None).
+
+    metrics: any of 'sales', 'units', 'sale_count', 'expenses', 'profit_loss'.
+    """
+    _check_metrics(metrics)
+    values = {'sales': 0.0, 'units': 0, 'sale_count': 0, 'expenses': 0.0}
+
+    if _needs_sales(metrics):
+        query = db.session.query(*_sales_columns()).filter(DailySales.user_id == user_id)
+        values['sales'], values['units'], values['sale_count'] = _in_period(query, DailySales.day, period).one()
+
+    if _needs_expenses(metrics):
+        query = db.session.query(func.coalesce(func.sum(DailyExpense.total), 0.0)).filter(
+            DailyExpense.user_id == user_id)
+        values['expenses'] = _in_period(query, DailyExpense.day, period).scalar()
+
+    return _pick(values, metrics)
+
+
+def compare(user_id, periods):
+    """
+    Returns [{'sales', 'units', 'sale_count'}] for each day-aligned period in `periods`, in order.
+
+    All periods are aggregated by one GROUP BY over a CASE that maps each rollup day to its
+    period, so the cost is a single query whatever the number of periods. Periods must not
+    partially overlap (periods of one granularity never do); repeated periods are fine.
+    """
+    distinct = list(dict.fromkeys(periods))
+    ranges = [and_(DailySales.day >= period.start_day, DailySales.day < period.end_day) for period in distinct]
+    slot = case(*((in_range, index) for index, in_range in enumerate(ranges)))
+
+    values = [{'sales': 0.0, 'units': 0, 'sale_count': 0} for _ in distinct]
+    query = db.session.query(slot, *_sales_columns()).filter(DailySales.user_id == user_id, or_(*ranges))
+    for index, revenue, units, sale_count in query.group_by(slot):
+        values[index] = {'sales': revenue, 'units': units, 'sale_count': sale_count}
+
+    return [dict(values[distinct.index(period)]) for period in periods]
+
+
+def first_day(user_id):
+    """The earliest day with any sale or expense for the user, or None if they have neither."""
+    days = [
+        db.session.query(func.min(DailySales.day)).filter(DailySales.user_id == user_id).scalar(),
+        db.session.query(func.min(DailyExpense.day)).filter(DailyExpense.user_id == user_id).scalar(),
+    ]
+    days = [day for day in days if day is not None]
+    return min(days) if days else None
+
+
+def _bucket(day_column, granularity):
+    """SQL expression mapping a rollup day to the ISO date string of its bucket's first day."""
+    if granularity == 'day':
+        return func.date(day_column)
+    if granularity == 'week':
+        return func.date(day_column, '-6 days', 'weekday 1')
+    if granularity == 'month':
+        return func.date(day_column, 'start of month')
+    if granularity == 'quarter':
+        months_into_quarter = (cast(func.strftime('%m', day_column), db.Integer) - 1) % 3
+        return func.date(day_column, 'start of month', '-' + cast(months_into_quarter, db.String) + ' months')
+    if granularity == 'year':
+        return func.date(day_column, 'start of year')
+    raise ValueError(f"Unknown granularity: {granularity}. Use any of {', '.join(GRANULARITIES)}.")
+
+
+def bucket_start(day, granularity):
+    """Python twin of `_bucket`: the first day of the bucket containing `day`."""
+    if granularity == 'day':
+        return day
+    if granularity == 'week':
+        return day - timedelta(days=day.weekday())
+    if granularity == 'month':
+        return day.replace(day=1)
+    if granularity == 'quarter':
+        return date(day.year, 3 * ((day.month - 1) // 3) + 1, 1)
+    if granularity == 'year':
+        return date(day.year, 1, 1)
+    raise ValueError(f"Unknown granularity: {granularity}. Use any of {', '.join(GRANULARITIES)}.")
+
+
+def next_bucket_start(start, granularity):
+    if granularity == 'day':
+        return start + timedelta(days=1)
+    if granularity == 'week':
+        return start + timedelta(days=7)
+    months = {'month': 1, 'quarter': 3, 'year': 12}[granularity]
+    month_index = start.year * 12 + start.month - 1 + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def bucket_count(granularity, period):
+    """The number of buckets `series` returns for `period`, without generating them."""
+    first = bucket_start(period.start_day, granularity)
+    last = bucket_start(period.last_day, granularity)
+    if granularity == 'day':
+        return (last - first).days + 1
+    if granularity == 'week':
+        return (last - first).days // 7 + 1
+    months = {'month': 1, 'quarter': 3, 'year': 12}[granularity]
+    return ((last.year - first.year) * 12 + last.month - first.month) // months + 1
+
+
+def bucket_starts(granularity, period):
+    """Every bucket start overlapping `period`, so series come back dense (no missing buckets)."""
+    start = bucket_start(period.start_day, granularity)
+    while start < period.end_day:
+        yield start
+        start = next_bucket_start(start, granularity)
+
+
+def series(user_id, metrics, granularity, period):
+    """
+    Returns one {'period_start': 'YYYY-MM-DD', metric: value, ...} dict per bucket of `period`.
+
+    Each table is aggregated with a single GROUP BY on the bucket expression, so the cost
+    is one query per table whatever the number of buckets. Raises ValueError when `period`
+    spans more than MAX_SERIES_BUCKETS buckets.
+    """
+    _check_metrics(metrics)
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"Unknown granularity: {granularity}. Use any of {', '.join(GRANULARITIES)}.")
+    if bucket_count(granularity, period) > MAX_SERIES_BUCKETS:
+        raise ValueError(
+            f"The range spans more than {MAX_SERIES_BUCKETS} {granularity} buckets; "
+            "narrow it or use a coarser granularity.")
+
+    empty = {'sales': 0.0, 'units': 0, 'sale_count': 0, 'expenses': 0.0}
+    buckets = {start.isoformat(): dict(empty) for start in bucket_starts(granularity, period)}
+
+    if _needs_sales(metrics):
+        bucket = _bucket(DailySales.day, granularity)
+        query = db.session.query(bucket, *_sales_columns()).filter(DailySales.user_id == user_id)
+        for key, revenue, units, sale_count in _in_period(query, DailySales.day, period).group_by(bucket):
+            buckets[key].update(sales=revenue, units=units, sale_count=sale_count)
+
+    if _needs_expenses(metrics):
+        bucket = _bucket(DailyExpense.day, granularity)
+        query = db.session.query(bucket, func.sum(DailyExpense.total)).filter(DailyExpense.user_id == user_id)
+        for key, total in _in_period(query, DailyExpense.day, period).group_by(bucket):
+            buckets[key]['expenses'] = total
+
+    return [{'period_start': key, **_pick(values, metrics)} for key, values in buckets.items()]
+
+
+def product_totals(user_id=None, product_id=None, period=None, limit=None, descending=True):
+    """
+    Returns [{'product_id', 'product_name', 'total_sales', 'units'}] ordered by revenue.
+
+    The rollups carry no product dimension, so this aggregates the `sale` table directly,
+    still with a single GROUP BY in SQL. user_id=None covers every user.
+    """
+    revenue = func.sum(Sale.quantity * Sale.sale_price)
+    query = db.session.query(
+        Product.id, Product.product_name, revenue, func.sum(Sale.quantity)
+    ).join(Sale, Product.id == Sale.product_id)
+    if user_id is not None:
+        query = query.filter(Sale.user_id == user_id)
+    if product_id is not None:
+        query = query.filter(Sale.product_id == product_id)
+    if period is not None:
+        query = query.filter(Sale.sale_date >= period.start, Sale.sale_date < period.end)
+
+    query = query.group_by(Product.id, Product.product_name).order_by(revenue.desc() if descending else revenue.asc())
+    if limit is not None:
+        query = query.limit(limit)
+
+    return [
+        {'product_id': pid, 'product_name': name, 'total_sales': sales or 0.0, 'units': units or 0}
+        for pid, name, sales, units in query
+    ]
+
+
+def top_and_bottom_products(user_id=None, count=5):
+    """The `count` best and worst selling products by revenue."""
+    return {
+        'top_products': product_totals(user_id, limit=count),
+        'bottom_products': product_totals(user_id, limit=count, descending=False),
+    }
+
+
+def weekly_profit_loss_series(user_id, year):
+    """Sales, expenses and profit/loss for every ISO week (52 or 53) of ISO year `year`."""
+    weeks = series(user_id, ('sales', 'expenses', 'profit_loss'), 'week', iso_year_period(year))
+    return [
+        {
+            'week': number,
+            'start_of_week': week['period_start'],
+            'total_sales': week['sales'],
+            'total_expenses': week['expenses'],
+            'profit_loss': week['profit_loss'],
+        }
+        for number, week in enumerate(weeks, start=1)
+    ]
@@ -0,0 +1,24 @@
+from datetime import datetime
+
+from extensions import db
+from models.data_version import DataVersion
+
+
+def bump(user_id):
+    """
+    Marks the user's data as changed. Call it inside the write's transaction, before commit,
+    so the new version becomes visible atomically with the data it describes.
+    """
+    row = db.session.get(DataVersion, user_id)
+    if row is None:
+        db.session.add(DataVersion(user_id=user_id, version=1, updated_at=datetime.now()))
+        return
+    # Increment in SQL so concurrent writers cannot lose an update.
+    row.version = DataVersion.version + 1
+    row.updated_at = datetime.now()
+
+
+def current(user_id):
+    """The user's current data version; 0 if they have never written anything."""
+    version = db.session.query(DataVersion.version).filter(DataVersion.user_id == user_id).scalar()
+    return version or 0
@@ -13,7 +13,15 @@ from views.taxes import tax_storage_blueprint
 from extensions import db, migrate, jwt, swagger
 from agent.views import agent
 from reports.product_performance import product_performance_bp
+from reports.graphs import graphs_bp
+from reports.predictions import predictions_bp
+from reports.model_registry import model_registry
+from reports.jobs import jobs, jobs_bp
+from reports.charts import chart_cache, render_pool
 from agent.recommendation import recommendation_bp
+from analytics.cache import report_cache
+from analytics.ledger import ledgers
+from compression import compression
 
 
 
@@ -32,6 +40,9 @@ app.register_blueprint(store_blueprint)
 app.register_blueprint(tax_storage_blueprint)
 app.register_blueprint(main_blueprint)
 app.register_blueprint(product_performance_bp)
+app.register_blueprint(graphs_bp)
+app.register_blueprint(predictions_bp)
+app.register_blueprint(jobs_bp)
 app.register_blueprint(recommendation_bp)
 db.init_app(app)
  
@@ -39,6 +50,13 @@ db.init_app(app)
 migrate.init_app(app, db)
 jwt.init_app(app)
 swagger.init_app(app)
+report_cache.init_app(app)
+ledgers.init_app(app)
+compression.init_app(app)
+chart_cache.init_app(app)
+render_pool.init_app(app)
+model_registry.init_app(app)
+jobs.init_app(app)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,93 @@
+"""
+Rows/sec of the list endpoints' read path, before and after column projection + orjson.
+
+    python -m benchmarks.list_serialization [--rows 100000] [--repeat 3]
+
+Builds a scratch SQLite database with `--rows` sales for one user, then times one page
+of every row through:
+
+  orm + to_dict + jsonify   the old path: hydrate Sale objects, copy each with to_dict()
+  projected + orjson        views.serialization.list_response, every column
+  projected + orjson, fields=id,sale_price   the same with a sparse fieldset
+
+The page size cap is lifted so each run serialises the whole list.
+"""
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from flask import Flask, jsonify
+
+from extensions import db
+import models  # noqa: F401 -- registers every table for create_all
+from models.sale import Sale
+from views import pagination
+from views.serialization import list_response
+
+
+def build_app(path):
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{path}'
+    db.init_app(app)
+    return app
+
+
+def seed(rows):
+    start = datetime(2024, 1, 1)
+    db.session.execute(Sale.__table__.insert(), [
+        {'product_id': 1 + i % 50, 'quantity': 1 + i % 5, 'sale_price': 9.99 + i % 7,
+         'sale_date': start + timedelta(minutes=i), 'user_id': 1}
+        for i in range(rows)
+    ])
+    db.session.commit()
+
+
+def orm_to_dict():
+    sales = Sale.query.filter(Sale.user_id == 1).order_by(Sale.sale_date, Sale.id).all()
+    return jsonify({'items': [sale.to_dict() for sale in sales]}).get_data()
+
+
+def projected():
+    return list_response(Sale, [Sale.user_id == 1], Sale.sale_date, Sale.id).get_data()
+
+
+def best_of(app, fn, query_string, repeat):
+    timings = []
+    for _ in range(repeat):
+        with app.test_request_context(query_string=query_string):
+            started = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - started)
+            db.session.remove()
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as scratch:
+        app = build_app(os.path.join(scratch, 'bench.sqlite3'))
+        pagination.MAX_PAGE_SIZE = args.rows
+        limit = {'limit': args.rows}
+        cases = [
+            ('orm + to_dict + jsonify', orm_to_dict, limit),
+            ('projected + orjson', projected, limit),
+            ('projected + orjson, fields=id,sale_price', projected, {**limit, 'fields': 'id,sale_price'}),
+        ]
+        with app.app_context():
+            db.create_all()
+            seed(args.rows)
+            baseline = None
+            for name, fn, query_string in cases:
+                seconds = best_of(app, fn, query_string, args.repeat)
+                baseline = baseline or seconds
+                print(f'{name:<42} {seconds:7.3f} s  {args.rows / seconds:>10,.0f} rows/s  {baseline / seconds:5.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,143 @@
+"""
+Negotiated gzip/brotli compression of responses.
+
+Brotli is used when the client accepts it and the optional `brotli` package is installed;
+otherwise gzip. Bodies under COMPRESS_MIN_SIZE are sent as-is, streamed responses are
+compressed chunk by chunk (flushing after each chunk so clients still get bytes as soon
+as they are produced), and formats that are already compressed are skipped.
+"""
+import zlib
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+# Media types whose payloads are already compressed; re-compressing them only costs CPU.
+COMPRESSED_MIMETYPES = {
+    'image/png', 'image/jpeg', 'image/gif', 'image/webp', 'image/avif',
+    'application/zip', 'application/gzip', 'application/x-gzip', 'application/pdf',
+    'application/octet-stream',
+}
+
+
+class _Gzip:
+    name = 'gzip'
+
+    def __init__(self, level):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits=31: gzip container
+
+    def compress(self, data):
+        return self._compressor.compress(data)
+
+    def flush(self):
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self._compressor.flush()
+
+
+class _Brotli:
+    name = 'br'
+
+    def __init__(self, quality):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data):
+        return self._compressor.process(data)
+
+    def flush(self):
+        return self._compressor.flush()
+
+    def finish(self):
+        return self._compressor.finish()
+
+
+class Compression:
+    def __init__(self):
+        self.enabled = True
+        self.min_size = 500
+        self.gzip_level = 6
+        self.brotli_enabled = True
+        self.brotli_quality = 4
+        self.skip_compressed = True
+
+    def init_app(self, app):
+        self.enabled = app.config.get('COMPRESS_ENABLED', self.enabled)
+        self.min_size = app.config.get('COMPRESS_MIN_SIZE', self.min_size)
+        self.gzip_level = app.config.get('COMPRESS_GZIP_LEVEL', self.gzip_level)
+        self.brotli_enabled = app.config.get('COMPRESS_BROTLI', self.brotli_enabled)
+        self.brotli_quality = app.config.get('COMPRESS_BROTLI_QUALITY', self.brotli_quality)
+        self.skip_compressed = app.config.get('COMPRESS_SKIP_COMPRESSED', self.skip_compressed)
+        app.after_request(self.compress_response)
+
+    def _compressor(self):
+        """A compressor for the best encoding the client accepts, or None."""
+        accepted = request.accept_encodings
+        if self.brotli_enabled and brotli is not None and accepted['br']:
+            return _Brotli(self.brotli_quality)
+        if accepted['gzip']:
+            return _Gzip(self.gzip_level)
+        return None
+
+    def _skip(self, response):
+        if not self.enabled or request.method == 'HEAD':
+            return True
+        if response.status_code < 200 or response.status_code in (204, 206, 304):
+            return True
+        # direct_passthrough bodies are file wrappers meant to be sent untouched.
+        if 'Content-Encoding' in response.headers or response.direct_passthrough:
+            return True
+        return self.skip_compressed and (
+            response.mimetype in COMPRESSED_MIMETYPES
+            or response.mimetype.startswith(('video/', 'audio/'))
+        )
+
+    def compress_response(self, response):
+        if self._skip(response):
+            return response
+        response.vary.add('Accept-Encoding')
+        if not response.is_streamed and len(response.get_data()) < self.min_size:
+            return response
+
+        compressor = self._compressor()
+        if compressor is None:
+            return response
+
+        if response.is_streamed:
+            response.response = self._stream(response, compressor)
+            response.headers.pop('Content-Length', None)
+        else:
+            response.set_data(compressor.compress(response.get_data()) + compressor.finish())
+        response.headers['Content-Encoding'] = compressor.name
+
+        # The compressed bytes differ from the identity ones, so a strong ETag would be wrong;
+        # weak ETags still match If-None-Match, which compares weakly.
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
+
+    @staticmethod
+    def _stream(response, compressor):
+        original = response.response
+        chunks = response.iter_encoded()
+
+        def generate():
+            try:
+                for chunk in chunks:
+                    data = compressor.compress(chunk) + compressor.flush()
+                    if data:
+                        yield data
+                yield compressor.finish()
+            finally:
+                close = getattr(original, 'close', None)
+                if close is not None:
+                    close()
+
+        return generate()
+
+
+compression = Compression()
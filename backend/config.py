@@ -6,8 +6,42 @@ load_dotenv()
 FLASK_RUN_HOST = os.environ.get("FLASK_RUN_HOST", "0.0.0.0")
 FLASK_RUN_PORT = os.environ.get("FLASK_RUN_PORT", 5000)
 FLASK_DEBUG = os.environ.get("FLASK_DEBUG", False)
-SQLALCHEMY_DATABASE_URI = "sqlite:///db.sqlite3"
+SQLALCHEMY_DATABASE_URI = os.environ.get("DATABASE_URL", "sqlite:///db.sqlite3")
 JWT_SECRET_KEY = "YOUR_BUSINESS_COMPANION"
 JWT_TOKEN_LOCATION = ["headers"]
 JWT_IDENTITY_CLAIM = "user_id"
 
+
+# In-process cache of rendered report responses (see analytics/cache.py)
+REPORT_CACHE_ENABLED = True
+REPORT_CACHE_MAX_ENTRIES = int(os.environ.get("REPORT_CACHE_MAX_ENTRIES", 1024))
+REPORT_CACHE_MAX_BYTES = int(os.environ.get("REPORT_CACHE_MAX_BYTES", 32 * 1024 * 1024))
+
+# Byte budget for the in-memory per-user ledgers behind the date-range totals (see analytics/ledger.py)
+LEDGER_MAX_BYTES = int(os.environ.get("LEDGER_MAX_BYTES", 64 * 1024 * 1024))
+
+# Negotiated response compression (see compression.py). Brotli needs the optional `brotli` package.
+COMPRESS_ENABLED = os.environ.get("COMPRESS_ENABLED", "true").lower() == "true"
+COMPRESS_MIN_SIZE = int(os.environ.get("COMPRESS_MIN_SIZE", 500))
+COMPRESS_GZIP_LEVEL = 6
+COMPRESS_BROTLI = True
+COMPRESS_BROTLI_QUALITY = 4
+COMPRESS_SKIP_COMPRESSED = True  # leave PNG/JPEG/zip and other already-compressed bodies alone
+
+# On-disk cache of rendered charts (see reports/charts.py); defaults to <instance>/chart_cache
+CHART_CACHE_DIR = os.environ.get("CHART_CACHE_DIR")
+CHART_CACHE_MAX_BYTES = int(os.environ.get("CHART_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+
+# Charts render in a bounded process pool; 0 workers renders inline in the request thread
+CHART_RENDER_WORKERS = int(os.environ.get("CHART_RENDER_WORKERS", min(4, os.cpu_count() or 1)))
+CHART_RENDER_MAX_PENDING = int(os.environ.get("CHART_RENDER_MAX_PENDING", 16))
+CHART_RENDER_TIMEOUT = 30
+
+# Fitted forecast/prediction models (see reports/model_registry.py); defaults to <instance>/models.
+# A user's models are retrained once their data version has moved this many writes past training.
+MODEL_REGISTRY_DIR = os.environ.get("MODEL_REGISTRY_DIR")
+MODEL_RETRAIN_AFTER = int(os.environ.get("MODEL_RETRAIN_AFTER", 25))
+
+# Background jobs for model training and slow reports (see reports/jobs.py)
+JOB_WORKERS = int(os.environ.get("JOB_WORKERS", 2))
+JOB_RESULT_TTL = 3600  # seconds a finished job's result stays available at /jobs/<id>
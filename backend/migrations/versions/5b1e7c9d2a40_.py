@@ -0,0 +1,56 @@
+"""add daily sales and expense rollups
+
+Revision ID: 5b1e7c9d2a40
+Revises: 1285c3d2eefd
+Create Date: 2025-03-18 10:12:31.402117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b1e7c9d2a40'
+down_revision = '1285c3d2eefd'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('daily_sales',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('revenue', sa.Float(), nullable=False),
+    sa.Column('units', sa.Integer(), nullable=False),
+    sa.Column('sale_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'day')
+    )
+    op.create_table('daily_expenses',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('category', sa.String(length=50), nullable=False),
+    sa.Column('total', sa.Float(), nullable=False),
+    sa.Column('expense_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'day', 'category')
+    )
+
+    # Backfill from existing history so reports stay correct after the switch.
+    op.execute("""
+        INSERT INTO daily_sales (user_id, day, revenue, units, sale_count)
+        SELECT user_id, date(sale_date), SUM(quantity * sale_price), SUM(quantity), COUNT(*)
+        FROM sale
+        GROUP BY user_id, date(sale_date)
+    """)
+    op.execute("""
+        INSERT INTO daily_expenses (user_id, day, category, total, expense_count)
+        SELECT user_id, date(date), COALESCE(category, ''), SUM(amount), COUNT(*)
+        FROM expenses
+        GROUP BY user_id, date(date), COALESCE(category, '')
+    """)
+
+
+def downgrade():
+    op.drop_table('daily_expenses')
+    op.drop_table('daily_sales')
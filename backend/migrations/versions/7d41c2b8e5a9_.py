@@ -0,0 +1,28 @@
+"""add products.sku for catalog sync
+
+Revision ID: 7d41c2b8e5a9
+Revises: e2a7d05b9f13
+Create Date: 2025-03-24 10:17:38.402915
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7d41c2b8e5a9'
+down_revision = 'e2a7d05b9f13'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('products', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('sku', sa.String(length=64), nullable=True))
+        batch_op.create_index('ix_products_user_id_sku', ['user_id', 'sku'], unique=True)
+
+
+def downgrade():
+    with op.batch_alter_table('products', schema=None) as batch_op:
+        batch_op.drop_index('ix_products_user_id_sku')
+        batch_op.drop_column('sku')
@@ -0,0 +1,56 @@
+"""index hot user_id / date access paths
+
+Revision ID: 9c3f4a8e61b2
+Revises: 5b1e7c9d2a40
+Create Date: 2025-03-19 09:41:05.118203
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9c3f4a8e61b2'
+down_revision = '5b1e7c9d2a40'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('sale', schema=None) as batch_op:
+        batch_op.create_index('ix_sale_user_id_sale_date', ['user_id', 'sale_date'], unique=False)
+
+    with op.batch_alter_table('expenses', schema=None) as batch_op:
+        batch_op.create_index('ix_expenses_user_id_date', ['user_id', 'date'], unique=False)
+
+    with op.batch_alter_table('taxes', schema=None) as batch_op:
+        batch_op.create_index('ix_taxes_user_id_tax_date', ['user_id', 'tax_date'], unique=False)
+
+    with op.batch_alter_table('products', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_products_user_id'), ['user_id'], unique=False)
+
+    with op.batch_alter_table('store', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_store_user_id'), ['user_id'], unique=False)
+
+    with op.batch_alter_table('chat_messages', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_chat_messages_chat_id'), ['chat_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('chat_messages', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_chat_messages_chat_id'))
+
+    with op.batch_alter_table('store', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_store_user_id'))
+
+    with op.batch_alter_table('products', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_products_user_id'))
+
+    with op.batch_alter_table('taxes', schema=None) as batch_op:
+        batch_op.drop_index('ix_taxes_user_id_tax_date')
+
+    with op.batch_alter_table('expenses', schema=None) as batch_op:
+        batch_op.drop_index('ix_expenses_user_id_date')
+
+    with op.batch_alter_table('sale', schema=None) as batch_op:
+        batch_op.drop_index('ix_sale_user_id_sale_date')
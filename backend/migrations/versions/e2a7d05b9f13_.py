@@ -0,0 +1,30 @@
+"""add per-user data versions
+
+Revision ID: e2a7d05b9f13
+Revises: 9c3f4a8e61b2
+Create Date: 2025-03-21 14:03:52.667410
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2a7d05b9f13'
+down_revision = '9c3f4a8e61b2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('data_versions',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+
+
+def downgrade():
+    op.drop_table('data_versions')
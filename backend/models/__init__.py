@@ -6,6 +6,8 @@ from models.sale import Sale
 from models.expense import Expense
 from models.tax import Tax
 from models.chat import Chat, ChatMessage
+from models.rollup import DailySales, DailyExpense
+from models.data_version import DataVersion
 __all__ = [
     "Product",
     "User",
@@ -16,4 +18,7 @@ __all__ = [
     "Tax",
     "Chat",
     "ChatMessage",
+    "DailySales",
+    "DailyExpense",
+    "DataVersion",
 ]
\ No newline at end of file
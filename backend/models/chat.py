@@ -16,7 +16,7 @@ class Chat(db.Model):
 class ChatMessage(db.Model):
     __tablename__ = 'chat_messages'
     id = Column(Integer, primary_key=True)
-    chat_id = Column(Integer, ForeignKey('chats.id'), nullable=False)
+    chat_id = Column(Integer, ForeignKey('chats.id'), nullable=False, index=True)
     sender = Column(String(50), nullable=False)  # 'user' or 'agent'
     message = Column(String(1000), nullable=False)
     timestamp = Column(DateTime, default=datetime.utcnow)
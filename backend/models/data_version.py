@@ -0,0 +1,17 @@
+from datetime import datetime
+from extensions import db
+
+
+class DataVersion(db.Model):
+    """Per-user change counter, bumped in the same transaction as every sale/expense/tax write."""
+    __tablename__ = 'data_versions'
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.now)
+
+    def to_dict(self):
+        return {
+            'user_id': self.user_id,
+            'version': self.version,
+            'updated_at': self.updated_at.isoformat(),
+        }
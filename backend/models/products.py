@@ -2,14 +2,18 @@ from extensions import db
 
 class Product(db.Model):
     __tablename__="products"
+    __table_args__ = (
+        db.Index('ix_products_user_id_sku', 'user_id', 'sku', unique=True),
+    )
     id = db.Column(db.Integer, primary_key=True)
     product_name = db.Column(db.String, nullable=False)
     description = db.Column(db.Text)
     initial_stock = db.Column(db.Integer, nullable=False)
     price = db.Column(db.Integer, nullable=False)
     category = db.Column(db.String)
+    sku = db.Column(db.String(64)) # stable external id used by catalog sync
 
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False) # Foreign key in Product
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True) # Foreign key in Product
     user = db.relationship('User', backref=db.backref('products', lazy=True))
 
 
@@ -21,5 +25,6 @@ class Product(db.Model):
             "initial_stock": self.initial_stock,
             "price": self.price,
             "category": self.category,
+            "sku": self.sku,
             "user_id": self.user_id,
         }
\ No newline at end of file
@@ -0,0 +1,39 @@
+from extensions import db
+
+
+class DailySales(db.Model):
+    """Per-user, per-day sales totals kept in step with the `sale` table."""
+    __tablename__ = 'daily_sales'
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+    revenue = db.Column(db.Float, nullable=False, default=0.0)
+    units = db.Column(db.Integer, nullable=False, default=0)
+    sale_count = db.Column(db.Integer, nullable=False, default=0)
+
+    def to_dict(self):
+        return {
+            'user_id': self.user_id,
+            'day': self.day.isoformat(),
+            'revenue': self.revenue,
+            'units': self.units,
+            'sale_count': self.sale_count,
+        }
+
+
+class DailyExpense(db.Model):
+    """Per-user, per-day, per-category expense totals kept in step with `expenses`."""
+    __tablename__ = 'daily_expenses'
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+    category = db.Column(db.String(50), primary_key=True, default='')  # '' for uncategorised
+    total = db.Column(db.Float, nullable=False, default=0.0)
+    expense_count = db.Column(db.Integer, nullable=False, default=0)
+
+    def to_dict(self):
+        return {
+            'user_id': self.user_id,
+            'day': self.day.isoformat(),
+            'category': self.category or None,
+            'total': self.total,
+            'expense_count': self.expense_count,
+        }
@@ -2,6 +2,9 @@ from datetime import datetime
 from extensions import db
 
 class Sale(db.Model):
+    __table_args__ = (
+        db.Index('ix_sale_user_id_sale_date', 'user_id', 'sale_date'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     product_id = db.Column(db.Integer, db.ForeignKey('products.id'), nullable=False)
     quantity = db.Column(db.Integer, nullable=False)
@@ -9,7 +9,7 @@ class Store(db.Model):
     address = db.Column(db.String) 
     phone_number = db.Column(db.String)
 
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False) # Foreign key in Store
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True) # Foreign key in Store
     user = db.relationship('User', backref=db.backref('stores', lazy=True))
 
 
@@ -3,6 +3,9 @@ from extensions import db
 
 class Tax(db.Model):
     __tablename__ = 'taxes'
+    __table_args__ = (
+        db.Index('ix_taxes_user_id_tax_date', 'user_id', 'tax_date'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     tax_rate = db.Column(db.Float, nullable=False)
@@ -0,0 +1,258 @@
+"""
+Chart rendering with an on-disk cache.
+
+A chart is described by a plain, JSON-serialisable spec:
+
+    {'kind': 'bar' | 'line', 'title': ..., 'xlabel': ..., 'ylabel': ..., 'x': [labels],
+     'series': [{'name': ..., 'values': [...]}], 'figsize': [w, h], 'colors': [...],
+     'legend_title': ...}
+
+The rendered image is keyed by a hash of the spec and the output format, so the same
+input series is rendered once and then served from disk until it is evicted (least
+recently used first, under CHART_CACHE_MAX_BYTES).
+
+Rendering uses the object-oriented `Figure` API (no pyplot global state) and runs in a
+bounded process pool, so concurrent requests render in parallel on separate cores.
+"""
+import base64
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as RenderTimeout
+from concurrent.futures.process import BrokenProcessPool
+
+from flask import current_app, jsonify, request
+from matplotlib.figure import Figure
+
+MIMETYPES = {
+    'png': 'image/png',
+    'svg': 'image/svg+xml',
+}
+
+# Bump when render() output changes so old cache files are not served.
+RENDERER_VERSION = 2
+
+
+def chart_key(spec, fmt):
+    payload = json.dumps({'spec': spec, 'format': fmt, 'renderer': RENDERER_VERSION}, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def render(spec, fmt):
+    """Renders a chart spec to PNG or SVG bytes. Safe to call from any thread or process."""
+    fig = Figure(figsize=spec.get('figsize', (8, 6)))
+    ax = fig.add_subplot()
+    if spec['kind'] == 'bar':
+        for series in spec['series']:
+            ax.bar(spec['x'], series['values'], color=spec.get('colors'), label=series['name'])
+    else:
+        for series in spec['series']:
+            ax.plot(spec['x'], series['values'], label=series['name'])
+        ax.legend(title=spec.get('legend_title'))
+    ax.set_title(spec.get('title', ''))
+    ax.set_xlabel(spec.get('xlabel', ''))
+    ax.set_ylabel(spec.get('ylabel', ''))
+    fig.tight_layout()
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format=fmt)  # Agg/SVG canvas picked by format; nothing global to close
+    return buffer.getvalue()
+
+
+class RenderPool:
+    """
+    A bounded pool of rendering processes.
+
+    At most `workers` charts render at once and at most `max_pending` wait in line; further
+    callers wait up to `timeout` seconds for a slot to free up. Requests for a chart that is already being rendered
+    share its result instead of rendering it again. workers=0 renders in the calling thread.
+    """
+
+    def __init__(self, workers=2, max_pending=8, timeout=30):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self._executor = None
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.workers = app.config.get('CHART_RENDER_WORKERS', self.workers)
+        self.max_pending = app.config.get('CHART_RENDER_MAX_PENDING', self.max_pending)
+        self.timeout = app.config.get('CHART_RENDER_TIMEOUT', self.timeout)
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+
+    def _get_executor(self):
+        # Created lazily, so each server worker process gets its own pool after it starts.
+        # 'spawn' keeps the children clear of locks held by the threaded parent at fork time.
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context('spawn'))
+        return self._executor
+
+    def _submit(self, key, spec, fmt):
+        with self._lock:
+            future = self._in_flight.get(key)
+            if future is not None:
+                return future
+
+        if not self._slots.acquire(timeout=self.timeout):
+            raise RenderTimeout(f'No render slot freed up within {self.timeout} seconds')
+        with self._lock:
+            future = self._in_flight.get(key)
+            if future is not None:
+                self._slots.release()
+                return future
+            try:
+                try:
+                    future = self._get_executor().submit(render, spec, fmt)
+                except BrokenProcessPool:
+                    # A worker died and took the pool with it; start a fresh one.
+                    self._executor.shutdown(wait=False)
+                    self._executor = None
+                    future = self._get_executor().submit(render, spec, fmt)
+            except BaseException:
+                self._slots.release()
+                raise
+            self._in_flight[key] = future
+
+        def done(_):
+            with self._lock:
+                self._in_flight.pop(key, None)
+            self._slots.release()
+
+        future.add_done_callback(done)
+        return future
+
+    def render(self, key, spec, fmt):
+        """
+        Renders `spec`. Raises RenderTimeout (concurrent.futures.TimeoutError) after waiting
+        `timeout` seconds for a slot or for the result, or if a worker died mid-render; the
+        next submit then starts a fresh pool.
+        """
+        if not self.workers:
+            return render(spec, fmt)
+        future = self._submit(key, spec, fmt)
+        try:
+            return future.result(timeout=self.timeout)
+        except BrokenProcessPool as e:
+            raise RenderTimeout('The render worker died') from e
+
+
+render_pool = RenderPool()
+
+
+class ChartCache:
+    """Rendered charts on disk, one file per key, evicted LRU by modification time (refreshed on every hit)."""
+
+    def __init__(self, directory=None, max_bytes=256 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._bytes = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.directory = app.config.get('CHART_CACHE_DIR') or os.path.join(app.instance_path, 'chart_cache')
+        self.max_bytes = app.config.get('CHART_CACHE_MAX_BYTES', self.max_bytes)
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, key, fmt):
+        return os.path.join(self.directory, f'{key}.{fmt}')
+
+    def get(self, key, fmt):
+        path = self._path(key, fmt)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        os.utime(path)  # mark as recently used
+        return data
+
+    def put(self, key, fmt, data):
+        path = self._path(key, fmt)
+        tmp = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)  # atomic, so readers never see a partial image
+
+        with self._lock:
+            if self._bytes is None:
+                self._bytes = sum(size for _, size, _ in self._files())
+            else:
+                self._bytes += len(data)
+            if self._bytes > self.max_bytes:
+                self._evict()
+
+    def _files(self):
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and not entry.name.endswith('.tmp'):
+                stat = entry.stat()
+                yield entry.path, stat.st_size, stat.st_mtime
+
+    def _evict(self):
+        files = sorted(self._files(), key=lambda file: file[2])
+        self._bytes = sum(size for _, size, _ in files)
+        # Evict down to 90% of the budget so we are not scanning the directory on every put.
+        target = self.max_bytes * 0.9
+        for path, size, _ in files:
+            if self._bytes <= target:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            self._bytes -= size
+
+
+chart_cache = ChartCache()
+
+
+def render_timeout_response():
+    """The 503 answer for a chart that did not render within CHART_RENDER_TIMEOUT."""
+    return jsonify({'message': 'Chart rendering timed out, try again shortly.'}), 503
+
+
+def render_cached(spec, fmt='png'):
+    """Returns (key, image bytes) for a chart spec, rendering only on a cache miss."""
+    key = chart_key(spec, fmt)
+    data = chart_cache.get(key, fmt)
+    if data is None:
+        data = render_pool.render(key, spec, fmt)
+        chart_cache.put(key, fmt, data)
+    return key, data
+
+
+def render_base64(spec, fmt='png'):
+    """The cached chart as a base64 string, for the JSON endpoints that embed images."""
+    _, data = render_cached(spec, fmt)
+    return base64.b64encode(data).decode('utf-8')
+
+
+def chart_format():
+    """The requested image format (`format` query parameter, png by default) or None if unsupported."""
+    fmt = request.args.get('format', 'png')
+    return fmt if fmt in MIMETYPES else None
+
+
+def chart_response(spec, fmt):
+    """
+    Serves a chart as a binary image. The ETag is the chart's content key, so a client
+    revalidating an unchanged chart gets a 304 without the image being read or rendered.
+    """
+    key = chart_key(spec, fmt)
+    if request.if_none_match.contains_weak(key):
+        response = current_app.response_class(status=304)
+    else:
+        try:
+            _, data = render_cached(spec, fmt)
+        except RenderTimeout:  # not the builtin TimeoutError before Python 3.11
+            return render_timeout_response()
+        response = current_app.response_class(data, mimetype=MIMETYPES[fmt])
+    response.set_etag(key)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
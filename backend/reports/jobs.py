@@ -0,0 +1,135 @@
+"""
+In-process background jobs for model training and slow reports.
+
+Routes submit work with `jobs.submit(key, fn, *args)` and answer 202 with a link to
+/jobs/<id> instead of holding a server thread for the duration. Submitting a key that
+is already queued or running returns that job, so repeated polls or identical requests
+never start duplicate fits. Finished jobs are kept for JOB_RESULT_TTL seconds.
+"""
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from flask import Blueprint, jsonify, url_for
+
+jobs_bp = Blueprint('jobs', __name__)
+
+QUEUED, RUNNING, SUCCEEDED, FAILED = 'queued', 'running', 'succeeded', 'failed'
+
+
+class Job:
+    def __init__(self, key):
+        self.id = uuid.uuid4().hex
+        self.key = key
+        self.status = QUEUED
+        self.result = None
+        self.error = None
+        self.submitted_at = datetime.now()
+        self.started_at = None
+        self.finished_at = None
+        self.finished = None  # monotonic time, for expiry
+
+    @property
+    def done(self):
+        return self.status in (SUCCEEDED, FAILED)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'kind': self.key[0],
+            'status': self.status,
+            'submitted_at': self.submitted_at.isoformat(),
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+            'result': self.result,
+            'error': self.error,
+        }
+
+
+class JobScheduler:
+    def __init__(self, workers=2, result_ttl=3600):
+        self.workers = workers
+        self.result_ttl = result_ttl
+        self.app = None
+        self._executor = None
+        self._jobs = {}
+        self._active = {}
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.app = app
+        self.workers = app.config.get('JOB_WORKERS', self.workers)
+        self.result_ttl = app.config.get('JOB_RESULT_TTL', self.result_ttl)
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='job')
+        return self._executor
+
+    def submit(self, key, fn, *args):
+        """
+        Runs `fn(*args)` in the background inside an app context and returns its Job.
+        `key` is a tuple whose first item names the kind of job; while a job with the same
+        key is queued or running, that job is returned instead of starting another.
+        `fn` must return something JSON-serialisable.
+        """
+        with self._lock:
+            self._prune()
+            job = self._active.get(key)
+            if job is not None:
+                return job
+            job = Job(key)
+            self._jobs[job.id] = job
+            self._active[key] = job
+            self._get_executor().submit(self._run, job, fn, args)
+            return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _run(self, job, fn, args):
+        job.status = RUNNING
+        job.started_at = datetime.now()
+        try:
+            with self.app.app_context():
+                job.result = fn(*args)
+            job.status = SUCCEEDED
+        except Exception as e:
+            job.error = str(e)
+            job.status = FAILED
+        finally:
+            job.finished_at = datetime.now()
+            job.finished = time.monotonic()
+            with self._lock:
+                if self._active.get(job.key) is job:
+                    del self._active[job.key]
+
+    def _prune(self):
+        cutoff = time.monotonic() - self.result_ttl
+        expired = [job_id for job_id, job in self._jobs.items() if job.done and job.finished < cutoff]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+
+jobs = JobScheduler()
+
+
+def accepted(job):
+    """The 202 response pointing a client at a submitted job."""
+    status_url = url_for('jobs.get_job', job_id=job.id)
+    response = jsonify({'job_id': job.id, 'status': job.status, 'status_url': status_url})
+    response.status_code = 202
+    response.headers['Location'] = status_url
+    return response
+
+
+@jobs_bp.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Status of a background job and, once it has succeeded, its result."""
+    job = jobs.get(job_id)
+    if job is None:
+        return jsonify({'message': 'Job not found'}), 404
+    return jsonify(job.to_dict())
@@ -0,0 +1,131 @@
+"""
+Fitted model registry.
+
+Models are trained per user (and per product where a route asks for one), persisted to
+disk with joblib together with their feature schema, and served from memory. A model is
+retrained only once the user's data version has moved MODEL_RETRAIN_AFTER writes past
+the version it was trained on, so most prediction requests do no fitting at all.
+"""
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+import joblib
+
+from analytics import versions
+from reports.jobs import jobs
+
+
+class ModelRegistry:
+    def __init__(self, directory=None, retrain_after=25, max_loaded=64):
+        self.directory = directory
+        self.retrain_after = retrain_after
+        self.max_loaded = max_loaded
+        self._loaded = OrderedDict()
+        self._lock = threading.Lock()
+        self._training = {}
+
+    def init_app(self, app):
+        self.directory = app.config.get('MODEL_REGISTRY_DIR') or os.path.join(app.instance_path, 'models')
+        self.retrain_after = app.config.get('MODEL_RETRAIN_AFTER', self.retrain_after)
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, key):
+        name, user_id, product_id = key
+        return os.path.join(self.directory, f"{name}-user{user_id}-{'all' if product_id is None else f'product{product_id}'}.joblib")
+
+    def _load(self, key):
+        with self._lock:
+            entry = self._loaded.get(key)
+            if entry is not None:
+                self._loaded.move_to_end(key)
+                return entry
+        try:
+            entry = joblib.load(self._path(key))
+        except FileNotFoundError:
+            return None
+        self._remember(key, entry)
+        return entry
+
+    def _remember(self, key, entry):
+        with self._lock:
+            self._loaded[key] = entry
+            self._loaded.move_to_end(key)
+            while len(self._loaded) > self.max_loaded:
+                self._loaded.popitem(last=False)
+
+    def _stale(self, entry, version):
+        if entry['model'] is None:
+            return version != entry['data_version']  # there was no data; any write may add some
+        # A version below the trained one means the counter was reset; retrain then too.
+        return version < entry['data_version'] or version - entry['data_version'] >= self.retrain_after
+
+    def fresh(self, name, user_id, product_id=None):
+        """The stored entry for model `name` if it is up to date, else None (it needs training)."""
+        entry = self._load((name, user_id, product_id))
+        if entry is None or self._stale(entry, versions.current(user_id)):
+            return None
+        return entry
+
+    def get(self, name, user_id, train, product_id=None):
+        """
+        The registry entry for model `name`: {'model', 'features', 'metadata', 'data_version',
+        'trained_at'}. 'model' is None when there was nothing to train on; that outcome is
+        remembered in memory (not on disk) until the data version moves on.
+
+        `train(user_id, product_id)` fits a fresh model and returns (model, features, metadata),
+        or None if there is no data. It runs only when no model is stored yet or the stored
+        one is stale, and at most once at a time per key.
+        """
+        key = (name, user_id, product_id)
+        version = versions.current(user_id)
+        entry = self._load(key)
+        if entry is not None and not self._stale(entry, version):
+            return entry
+
+        with self._lock:
+            key_lock = self._training.setdefault(key, threading.Lock())
+        with key_lock:
+            # Another request may have retrained while we waited for the lock.
+            entry = self._load(key)
+            if entry is not None and not self._stale(entry, version):
+                return entry
+
+            fitted = train(user_id, product_id)
+            model, features, metadata = fitted if fitted is not None else (None, [], {})
+            entry = {
+                'model': model,
+                'features': list(features),
+                'metadata': metadata,
+                'data_version': version,
+                'trained_at': datetime.now().isoformat(),
+            }
+            if model is None:
+                self._remember(key, entry)
+                return entry
+
+            path = self._path(key)
+            tmp = f'{path}.{os.getpid()}.tmp'
+            joblib.dump(entry, tmp)
+            os.replace(tmp, path)
+            self._remember(key, entry)
+            return entry
+
+
+model_registry = ModelRegistry()
+
+
+def _train(name, user_id, train, product_id):
+    entry = model_registry.get(name, user_id, train, product_id=product_id)
+    return {
+        'model': name,
+        'trained': entry['model'] is not None,
+        'trained_at': entry['trained_at'],
+        'data_version': entry['data_version'],
+    }
+
+
+def train_in_background(name, user_id, train, product_id=None):
+    """Submits (or joins) a background job that brings model `name` up to date; returns the Job."""
+    return jobs.submit(('train_model', name, user_id, product_id), _train, name, user_id, train, product_id)
@@ -1,33 +1,20 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint, jsonify, request
 import pandas as pd
 from sklearn.linear_model import LinearRegression
-from datetime import datetime, timedelta
-from models.sale import Sale  # Import your Sale model
-from models.products import Product  # Import your Product model
-from extensions import db  # Import the database instance
+from datetime import date, datetime, timedelta
+from analytics.cache import cached_report, current_user_id
+from analytics.forecast import forecast_products
+from analytics.frames import sales_frame
+from analytics.inventory import stock_outlook
+from reports.jobs import accepted
+from reports.model_registry import model_registry, train_in_background
 
 predictions_bp = Blueprint('predictions', __name__)
 
-def fetch_sales_data():
+def fetch_sales_data(user_id=None, product_id=None):
     """Fetches sales data from the database and returns it as a Pandas DataFrame."""
     try:
-        # Fetch sales data using traditional querying
-        sales = Sale.query.all()
-
-        # Convert sales data to a list of dictionaries
-        sales_data = [
-            {
-                'product_id': sale.product_id,
-                'quantity': sale.quantity,
-                'sale_date': sale.sale_date,
-                'sale_price': sale.sale_price
-            }
-            for sale in sales
-        ]
-
-        # Convert the list of dictionaries to a Pandas DataFrame
-        df = pd.DataFrame(sales_data)
-        return df
+        return sales_frame(('quantity', 'sale_date', 'sale_price'), user_id=user_id, product_id=product_id)
 
     except Exception as e:
         print(f"Error fetching sales data: {e}")
@@ -69,17 +56,27 @@ def train_sales_forecasting_model(df):
 
     return model
 
-def predict_future_sales(model, num_days):
-    """Predicts future sales for a given number of days."""
+def train_forecast(user_id, product_id=None):
+    """Registry trainer for the sales forecast: (model, features, metadata) or None without sales."""
+    processed_data = preprocess_sales_data(fetch_sales_data(user_id, product_id))
+    model = train_sales_forecasting_model(processed_data)
+    if model is None:
+        return None
+    # 'time' counts days from the first day of the training data, so it has to be kept.
+    return model, ['time'], {'origin': processed_data.index[0].date().isoformat()}
+
+def predict_future_sales(model, num_days, origin=None):
+    """
+    Predicts future sales for a given number of days. `origin` is the first day the model
+    was trained on, so future days continue its time axis instead of restarting at 0.
+    """
     if model is None:
         return []
 
     # Create a DataFrame for the future dates
     future_dates = [datetime.now() + timedelta(days=i) for i in range(1, num_days + 1)]
-    future_df = pd.DataFrame({'sale_date': future_dates})
-    future_df['sale_date'] = pd.to_datetime(future_df['sale_date'])
-    future_df = future_df.set_index('sale_date')
-    future_df['time'] = range(len(future_dates))
+    offset = (future_dates[0].date() - date.fromisoformat(origin)).days if origin else 0
+    future_df = pd.DataFrame({'time': range(offset, offset + len(future_dates))})
 
     # Predict sales for the future dates
     predictions = model.predict(future_df[['time']])
@@ -97,55 +94,69 @@ def predict_future_sales(model, num_days):
 
 @predictions_bp.route('/sales_forecast/<int:num_days>')
 def sales_forecast_route(num_days):
-    """API endpoint to get the sales forecast."""
-
-    # Fetch sales data
-    sales_data = fetch_sales_data()
-
-    # Preprocess sales data
-    processed_data = preprocess_sales_data(sales_data)
-
-    # Train the sales forecasting model
-    model = train_sales_forecasting_model(processed_data)
-
-    # Predict future sales
-    forecast = predict_future_sales(model, num_days)
-
-    return jsonify({'sales_forecast': forecast})
-
-# Stock Level Forecasting (Example)
-def fetch_product_data():
-    """Fetches product data from the database."""
+    """
+    API endpoint to get the sales forecast, for the user's total sales or, with
+    ?product_id=, for one product. Served from the model registry; when the model needs
+    (re)training this returns 202 with a /jobs/<id> link instead of fitting inline.
+    """
+    user_id = 1
+    product_id = request.args.get('product_id', type=int)
+
+    entry = model_registry.fresh('sales_forecast', user_id, product_id=product_id)
+    if entry is None:
+        # Fit in the background; the client polls the job and then asks again.
+        return accepted(train_in_background('sales_forecast', user_id, train_forecast, product_id=product_id))
+    if entry['model'] is None:
+        return jsonify({'sales_forecast': []})
+
+    forecast = predict_future_sales(entry['model'], num_days, entry['metadata']['origin'])
+
+    return jsonify({'sales_forecast': forecast, 'trained_at': entry['trained_at']})
+
+@predictions_bp.route('/sales_forecast/products')
+@cached_report
+def product_forecast_route():
+    """
+    Per-product daily forecasts with prediction intervals, fitted for the whole catalog in
+    one vectorised pass (trend plus day-of-week seasonality, see analytics/forecast.py).
+
+    Query params: days (horizon, default 30), history (days of history to fit, default 180),
+    level (interval coverage, default 0.95) and metric (sales or units).
+    """
+    user_id = current_user_id()
+    metric = request.args.get('metric', 'sales')
     try:
-        # Fetch product data using traditional querying
-        products = Product.query.all()
-        product_data = [{'id': p.id, 'initial_stock': p.initial_stock} for p in products]
-        return pd.DataFrame(product_data)
-    except Exception as e:
-        print(f"Error fetching product data: {e}")
-        return pd.DataFrame()
-
-def predict_stock_levels(num_days=30):
-    """Predicts future stock levels (this is a simplified example)."""
-    product_df = fetch_product_data()
-    if product_df.empty:
-        return "No product data available."
-
-    # This is a placeholder - replace with a real forecasting model
-    # For example, you could assume a constant rate of depletion
-    # or use a more sophisticated time series model.
-    predictions = {}
-    for index, row in product_df.iterrows():
-        product_id = row['id']
-        initial_stock = row['initial_stock']
-        # Simplistic assumption: stock decreases linearly over time
-        daily_depletion = initial_stock / num_days  # Very basic
-        future_levels = [max(0, initial_stock - daily_depletion * i) for i in range(num_days)]
-        predictions[product_id] = future_levels
-
-    return predictions
+        result = forecast_products(
+            user_id,
+            horizon=request.args.get('days', 30, type=int),
+            history_days=request.args.get('history', 180, type=int),
+            level=request.args.get('level', 0.95, type=float),
+            metric=metric,
+        )
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+
+    return jsonify({'user_id': user_id, 'metric': metric, **result})
 
 @predictions_bp.route('/stock_level_forecast')
+@cached_report
 def stock_level_forecast_route():
-    forecasts = predict_stock_levels()
-    return jsonify(forecasts)
\ No newline at end of file
+    """
+    Projected stock-out date and reorder flag per product, from current stock and the
+    daily sales velocity over a trailing window (see analytics/inventory.py).
+
+    Query params: window (days of sales to average, default 28), lead_time (days until a
+    reorder arrives, default 7) and safety_days (extra days of cover to keep, default 0).
+    """
+    user_id = current_user_id()
+    try:
+        products = stock_outlook(
+            user_id,
+            window_days=request.args.get('window', 28, type=int),
+            lead_time_days=request.args.get('lead_time', 7, type=int),
+            safety_days=request.args.get('safety_days', 0, type=int),
+        )
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+
+    return jsonify({'user_id': user_id, 'products': products})
@@ -1,44 +1,27 @@
 from datetime import datetime, timedelta
 import random
-from extensions import db
-from models.products import Product
-from models.sale import Sale
 from models.expense import Expense
 from models.users import User  
 from flask import Blueprint, jsonify, request
+import numpy as np
 import pandas as pd
 from sklearn.model_selection import train_test_split
 from sklearn.linear_model import LinearRegression
 from sklearn.metrics import mean_squared_error
-import matplotlib.pyplot as plt
-import io
-import base64
+from reports.charts import chart_format, chart_response, render_base64
+from analytics.frames import sales_frame
+from reports.jobs import accepted, jobs
+from reports.model_registry import model_registry, train_in_background
+from views.bulk import BulkError, read_rows
 
 
 product_performance_bp = Blueprint('product_performance_bp', __name__)
 
 
-def fetch_sales_data():
+def fetch_sales_data(user_id=None):
     """Fetches sales data from the database and returns it as a Pandas DataFrame."""
     try:
-        # Fetch sales data using traditional querying
-        sales = Sale.query.all()
-
-        # Convert sales data to a list of dictionaries
-        sales_data = [
-            {
-                'product_id': sale.product_id,
-                'quantity': sale.quantity,
-                'sale_date': sale.sale_date,
-                'sale_price': sale.sale_price,
-                'user_id': sale.user_id
-            }
-            for sale in sales
-        ]
-
-        # Convert the list of dictionaries to a Pandas DataFrame
-        df = pd.DataFrame(sales_data)
-        return df
+        return sales_frame(('product_id', 'quantity', 'sale_date', 'sale_price', 'user_id'), user_id=user_id)
 
     except Exception as e:
         print(f"Error fetching sales data: {e}")
@@ -93,100 +76,147 @@ def train_sales_prediction_model(df):
     return model
 
 def predict_sales(model, new_data):
-    """Predicts sales for new data using the trained model."""
+    """Predicts sales for new data (one row per prediction) using the trained model."""
     if model is None or new_data.empty:
         return []  # Return an empty list if model is None or new_data is empty
 
     # Preprocess the new data
     new_data = preprocess_sales_data(new_data)
 
-    # Ensure that the new data has the same columns as the training data
-    # This is important because the model was trained on a specific set of features
-    training_columns = model.feature_names_in_
-    for col in training_columns:
-        if col not in new_data.columns:
-            new_data[col] = 0  # Add missing columns with a default value of 0
-    new_data = new_data[training_columns]  # Select only the columns used for training
+    # Align to the columns the model was trained on in one step: dummy columns the model
+    # has not seen are dropped and the ones absent from this batch are filled with 0.
+    new_data = new_data.reindex(columns=model.feature_names_in_, fill_value=0)
 
     # Make predictions
     predictions = model.predict(new_data)
     return predictions.tolist()  # Convert predictions to a list
 
-@product_performance_bp.route('/predict_sales', methods=['POST'])
-def predict_sales_route():
-    """API endpoint to predict sales."""
+def train_prediction(user_id, product_id=None):
+    """Registry trainer for the sales prediction model: (model, features, metadata) or None without sales."""
+    model = train_sales_prediction_model(preprocess_sales_data(fetch_sales_data(user_id)))
+    if model is None:
+        return None
+    return model, model.feature_names_in_, {}
 
-    # Fetch sales data
-    sales_data = fetch_sales_data()
+NUMERIC_FEATURES = ('product_id', 'quantity', 'user_id')
+ID_FEATURES = ('product_id', 'user_id')
 
-    # Preprocess sales data
-    processed_data = preprocess_sales_data(sales_data)
+def prediction_frame(rows, user_id):
+    """
+    The feature rows of a prediction request as a DataFrame: integer ids, numeric quantity
+    and parsed sale_date. Rows without a user_id are the requesting user's.
 
-    # Train the sales prediction model
-    model = train_sales_prediction_model(processed_data)
+    Returns (frame, errors); errors lists {'row', 'message'} for every row with a missing,
+    non-numeric or non-finite feature (or a non-integer id) and the frame is None if there
+    are any, so a bad row can never change the columns or dtypes the others predict with.
+    """
+    df = pd.DataFrame(rows)
+    if 'user_id' not in df.columns:
+        df['user_id'] = user_id
+    df['user_id'] = df['user_id'].where(df['user_id'].notna() & (df['user_id'] != ''), user_id)
+
+    invalid = {}
+    for column in NUMERIC_FEATURES:
+        # CSV values arrive as strings; anything that does not parse becomes NaN.
+        values = pd.to_numeric(df[column], errors='coerce') if column in df.columns else pd.Series(np.nan, index=df.index)
+        bad = ~np.isfinite(values.astype(np.float64))
+        if column in ID_FEATURES:
+            bad |= values.mod(1).fillna(0) != 0
+        invalid[column] = bad
+        df[column] = values
+    dates = pd.to_datetime(df['sale_date'], errors='coerce') if 'sale_date' in df.columns else pd.Series(pd.NaT, index=df.index)
+    invalid['sale_date'] = dates.isna()
+
+    bad_rows = pd.DataFrame(invalid)
+    errors = [
+        {'row': int(index), 'message': f"Missing or invalid {', '.join(bad_rows.columns[flags])}"}
+        for index, flags in zip(bad_rows.index, bad_rows.to_numpy())
+        if flags.any()
+    ]
+    if errors:
+        return None, errors
+
+    df['sale_date'] = dates
+    for column in ID_FEATURES:
+        df[column] = df[column].astype(np.int64)
+    return df, []
 
-    # Get new data from the request
-    new_data = request.get_json()
-    new_df = pd.DataFrame([new_data])  # Convert to DataFrame
+@product_performance_bp.route('/predict_sales', methods=['POST'])
+def predict_sales_route():
+    """
+    API endpoint to predict sales, using the user's model from the registry.
+
+    Accepts one JSON object, or a batch as a JSON array of objects or a CSV body/upload with
+    the same fields (sale_date, product_id, quantity and optionally user_id). Returns one
+    prediction per row, in order, or 202 with a /jobs/<id> link while the model is being
+    (re)trained. A batch with any invalid row is rejected with 400 and every bad row listed.
+    """
+    user_id = 1
+
+    new_data = request.get_json(silent=True)
+    if isinstance(new_data, dict):
+        rows = [new_data]
+    else:
+        try:
+            rows = read_rows()
+        except BulkError as e:
+            return jsonify({'message': str(e)}), 400
+
+    new_df, errors = prediction_frame(rows, user_id)
+    if errors:
+        return jsonify({'message': 'No predictions were made', 'errors': errors}), 400
+
+    entry = model_registry.fresh('sales_prediction', user_id)
+    if entry is None:
+        # Fit in the background; the client polls the job and then sends the rows again.
+        return accepted(train_in_background('sales_prediction', user_id, train_prediction))
+    model = entry['model']
 
     # Predict sales for the new data
     predictions = predict_sales(model, new_df)
 
     return jsonify({'predictions': predictions})
 
+def fetch_product_sales():
+    """Every sale with its product name, as a DataFrame."""
+    return sales_frame(('product_name', 'quantity', 'sale_date', 'sale_price'))
+
+def sales_trend_chart(df):
+    """The chart spec of monthly sales per product, one line per product."""
+    df['sale_date'] = pd.to_datetime(df['sale_date'])
+    sales_trend = df.groupby([pd.Grouper(key='sale_date', freq='ME'), 'product_name'], observed=True)['sale_price'].sum().unstack(fill_value=0)
+
+    return {
+        'kind': 'line',
+        'title': 'Sales Trend Over Time by Product',
+        'xlabel': 'Date',
+        'ylabel': 'Total Sales',
+        'legend_title': 'Product',
+        'x': [month.strftime('%Y-%m') for month in sales_trend.index],
+        'series': [
+            {'name': str(product), 'values': [float(value) for value in sales_trend[product]]}
+            for product in sales_trend.columns
+        ],
+        'figsize': [12, 6],
+    }
+
 def generate_product_performance_report():
     """
     Generates a report on product performance, including total sales and a sales trend chart.
     """
     try:
-        # Fetch sales data with product names
-        sales_data = db.session.query(Sale, Product.product_name).join(Product, Sale.product_id == Product.id).all()
-
-        # Convert sales data to a Pandas DataFrame
-        sales_list = [
-            {
-                'product_name': product_name,
-                'quantity': sale.quantity,
-                'sale_date': sale.sale_date,
-                'sale_price': sale.sale_price
-            }
-            for sale, product_name in sales_data
-        ]
-        df = pd.DataFrame(sales_list)
+        df = fetch_product_sales()
 
         if df.empty:
             return "No sales data available."
 
         # Calculate total sales per product
-        product_sales = df.groupby('product_name')['sale_price'].sum().sort_values(ascending=False)
-
-        # Create a sales trend chart over time
-        df['sale_date'] = pd.to_datetime(df['sale_date'])
-        sales_trend = df.groupby(['product_name', pd.Grouper(key='sale_date', freq='M')])['sale_price'].sum().unstack()
-
-        # Generate the chart
-        plt.figure(figsize=(12, 6))
-        sales_trend.plot(ax=plt.gca())
-        plt.title('Sales Trend Over Time by Product')
-        plt.xlabel('Date')
-        plt.ylabel('Total Sales')
-        plt.legend(title='Product')
-        plt.tight_layout()
-
-        # Save the chart to a buffer
-        buffer = io.BytesIO()
-        plt.savefig(buffer, format='png')
-        buffer.seek(0)
-        plt.close()
-
-        # Encode the image to base64
-        image_png = buffer.getvalue()
-        graphic = base64.b64encode(image_png).decode('utf-8')
+        product_sales = df.groupby('product_name', observed=True)['sale_price'].sum().sort_values(ascending=False)
 
         # Prepare the report
         report = {
             'product_sales': product_sales.to_dict(),
-            'sales_trend_chart': graphic
+            'sales_trend_chart': render_base64(sales_trend_chart(df))
         }
 
         return report
@@ -196,6 +226,22 @@ def generate_product_performance_report():
 
 @product_performance_bp.route('/product_performance_report')
 def product_performance_report_route():
-    """API endpoint to get the product performance report."""
+    """
+    API endpoint to get the product performance report. With ?async=1 the report is
+    generated in the background and this returns 202 with a /jobs/<id> link.
+    """
+    if request.args.get('async', type=int):
+        return accepted(jobs.submit(('product_performance_report',), generate_product_performance_report))
     report = generate_product_performance_report()
-    return jsonify(report)
\ No newline at end of file
+    return jsonify(report)
+
+@product_performance_bp.route('/product_performance_report/chart')
+def product_performance_chart_route():
+    """The sales trend chart of the product performance report as an image (format=png or svg)."""
+    fmt = chart_format()
+    if fmt is None:
+        return jsonify({'message': 'Invalid format. Use png or svg.'}), 400
+    df = fetch_product_sales()
+    if df.empty:
+        return jsonify({'message': 'No sales data available.'}), 404
+    return chart_response(sales_trend_chart(df), fmt)
@@ -1,12 +1,10 @@
 import pandas as pd
-from models.products import Product 
-from models.sale import Sale   
-from extensions import db
+from analytics import service as analytics
 
 
 def analyze_sales_performance_orm():
     """
-    Analyzes sales data to identify top and bottom-performing products using SQLAlchemy ORM.
+    Identifies the top and bottom-performing products by revenue.
 
     Returns:
         tuple: A tuple containing two pandas DataFrames:
@@ -14,23 +12,11 @@ def analyze_sales_performance_orm():
             - bottom_products: DataFrame of bottom-performing products.
     """
     try:
-        # ORM query to join products and sales tables and calculate total sales per product
-        results = db.session.query(
-            Product.product_name,
-            db.func.sum(Sale.sale_price).label('total_sales')
-        ).join(Sale, Product.id == Sale.product_id).group_by(Product.product_name).order_by(db.func.sum(Sale.sale_price).desc()).all()
+        # Revenue per product is aggregated in SQL by the analytics service
+        performance = analytics.top_and_bottom_products()
 
-        # Convert the results to a pandas DataFrame
-        df = pd.DataFrame(results, columns=['product_name', 'total_sales'])
-
-        # Calculate the number of products to include in top and bottom lists (e.g., top 5 and bottom 5)
-        num_products = min(5, len(df))  # Ensure we don't try to slice beyond the DataFrame size
-
-        # Identify top-performing products
-        top_products = df.head(num_products)
-
-        # Identify bottom-performing products
-        bottom_products = df.tail(num_products)
+        top_products = pd.DataFrame(performance['top_products'])
+        bottom_products = pd.DataFrame(performance['bottom_products'])
 
         return top_products, bottom_products
 
@@ -0,0 +1,44 @@
+import os
+import tempfile
+
+# app.py builds the app at import time, so point it at scratch storage before importing it.
+_scratch = tempfile.mkdtemp(prefix='ybc-tests-')
+os.environ.setdefault('DATABASE_URL', 'sqlite:///' + os.path.join(_scratch, 'test.sqlite3'))
+os.environ.setdefault('CHART_CACHE_DIR', os.path.join(_scratch, 'chart_cache'))
+os.environ.setdefault('MODEL_REGISTRY_DIR', os.path.join(_scratch, 'models'))
+os.environ.setdefault('CHART_RENDER_WORKERS', '0')
+os.environ.setdefault('GOOGLE_API_KEY', 'test')  # the agent builds its clients on import
+
+import pytest
+
+from app import app as flask_app
+from extensions import db
+from analytics.cache import report_cache
+from analytics.ledger import ledgers
+from models.products import Product
+
+
+@pytest.fixture
+def app():
+    flask_app.config['TESTING'] = True
+    with flask_app.app_context():
+        db.create_all()
+        yield flask_app
+        db.session.remove()
+        db.drop_all()
+    report_cache.clear()
+    ledgers.clear()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def product(app):
+    """A product of user 1 with plenty of stock."""
+    product = Product(product_name='Widget', initial_stock=1000, price=10, user_id=1)
+    db.session.add(product)
+    db.session.commit()
+    return product
@@ -0,0 +1,62 @@
+from sqlalchemy import event
+
+from extensions import db
+from models.products import Product
+from models.sale import Sale
+
+
+def test_bulk_sales_are_recorded(client, product):
+    rows = [{'product_id': product.id, 'quantity': 2, 'sale_price': 5}, {'product_id': product.id, 'quantity': '1', 'sale_price': '7.5'}]
+
+    response = client.post('/transactions/bulk', json=rows)
+
+    assert response.status_code == 201
+    assert response.get_json()['created'] == 2
+    assert product.initial_stock == 997
+
+
+def test_non_finite_and_negative_values_are_row_errors(client, product):
+    rows = [
+        {'product_id': product.id, 'quantity': 1, 'sale_price': 5},
+        {'product_id': product.id, 'quantity': 1, 'sale_price': 'nan'},
+        {'product_id': product.id, 'quantity': 1, 'sale_price': 'inf'},
+        {'product_id': product.id, 'quantity': 1, 'sale_price': -3},
+        {'product_id': product.id, 'quantity': 'inf', 'sale_price': 5},
+        {'product_id': product.id, 'quantity': 'nan', 'sale_price': 5},
+        {'product_id': product.id, 'quantity': 1.5, 'sale_price': 5},
+        {'product_id': 'inf', 'quantity': 1, 'sale_price': 5},
+    ]
+
+    response = client.post('/transactions/bulk', json=rows)
+
+    assert response.status_code == 400
+    assert [error['row'] for error in response.get_json()['errors']] == [1, 2, 3, 4, 5, 6, 7]
+    assert Sale.query.count() == 0
+
+
+def test_other_users_products_are_not_found(client, product):
+    foreign = Product(product_name='Gadget', initial_stock=10, price=10, user_id=2)
+    db.session.add(foreign)
+    db.session.commit()
+
+    response = client.post('/transactions/bulk', json=[{'product_id': foreign.id, 'quantity': 4, 'sale_price': 5}])
+
+    assert response.status_code == 400
+    assert response.get_json()['errors'] == [{'row': 0, 'message': 'Product not found'}]
+    assert foreign.initial_stock == 10
+    assert Sale.query.count() == 0
+
+
+def test_stock_taken_after_the_check_rolls_the_batch_back(client, product):
+    def sell_the_stock(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith('UPDATE products'):
+            cursor.execute('UPDATE products SET initial_stock = 1 WHERE id = ?', (product.id,))
+
+    event.listen(db.engine, 'before_cursor_execute', sell_the_stock)
+    try:
+        response = client.post('/transactions/bulk', json=[{'product_id': product.id, 'quantity': 2, 'sale_price': 5}])
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', sell_the_stock)
+
+    assert response.status_code == 409
+    assert Sale.query.count() == 0
@@ -0,0 +1,63 @@
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+
+import pytest
+
+from analytics.rollups import apply_sale
+from extensions import db
+from models.sale import Sale
+from reports.charts import RenderPool, chart_cache, render_pool
+
+URL = '/sales_comparison/2025/1/2025/2'
+
+
+@pytest.fixture
+def sales(app, product):
+    sale = Sale(product_id=product.id, quantity=2, sale_price=5.0, user_id=1, sale_date=datetime(2025, 1, 15))
+    db.session.add(sale)
+    db.session.flush()
+    apply_sale(sale)
+    db.session.commit()
+
+
+@pytest.fixture
+def slow_renderer(monkeypatch):
+    def timed_out(key, spec, fmt):
+        raise FutureTimeoutError()
+
+    monkeypatch.setattr(chart_cache, 'get', lambda key, fmt: None)
+    monkeypatch.setattr(render_pool, 'render', timed_out)
+
+
+def test_image_route_answers_503_when_rendering_times_out(client, sales, slow_renderer):
+    assert client.get(URL + '/chart').status_code == 503
+
+
+def test_base64_route_answers_503_when_rendering_times_out(client, sales, slow_renderer):
+    assert client.get(URL).status_code == 503
+
+
+def test_charts_render(client, sales):
+    response = client.get(URL + '/chart')
+    assert response.status_code == 200
+    assert response.mimetype == 'image/png'
+    assert client.get(URL).get_json()['sales_comparison_graph']
+
+
+def test_render_pool_times_out_waiting_for_a_slot():
+    pool = RenderPool(workers=1, max_pending=1, timeout=0.01)
+    pool._slots.acquire()
+
+    with pytest.raises(FutureTimeoutError):
+        pool.render('key', {}, 'png')
+
+
+def test_render_pool_reports_a_dead_worker_as_a_timeout(monkeypatch):
+    pool = RenderPool(workers=1)
+    broken = Future()
+    broken.set_exception(BrokenProcessPool())
+    monkeypatch.setattr(pool, '_submit', lambda key, spec, fmt: broken)
+
+    with pytest.raises(FutureTimeoutError):
+        pool.render('key', {}, 'png')
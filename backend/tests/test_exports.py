@@ -0,0 +1,44 @@
+import json
+from datetime import datetime
+
+import pytest
+
+from extensions import db
+from models.sale import Sale
+
+
+@pytest.fixture
+def sales(app, product):
+    for day in (1, 15, 31):
+        db.session.add(Sale(product_id=product.id, quantity=1, sale_price=float(day), user_id=1,
+                            sale_date=datetime(2025, 1, day, 12)))
+    db.session.commit()
+
+
+def _exported_prices(client, query):
+    response = client.get('/transactions/export?' + query)
+    assert response.status_code == 200
+    return [json.loads(line)['sale_price'] for line in response.get_data(as_text=True).splitlines()]
+
+
+def test_export_date_filters_are_inclusive(client, sales):
+    assert _exported_prices(client, 'start_date=2025-01-15&end_date=2025-01-31') == [15, 31]
+    assert _exported_prices(client, 'end_date=2025-01-15') == [1, 15]
+    assert _exported_prices(client, 'start_date=2025-01-16') == [31]
+
+
+def test_export_end_past_the_last_bound_is_rejected(client, sales):
+    assert client.get('/transactions/export?start_date=2025-01-15&end_date=9999-12-31').status_code == 400
+
+
+def test_export_rejects_malformed_dates(client, sales):
+    assert client.get('/transactions/export?end_date=2025-13-01').status_code == 400
+
+
+def test_export_from_the_last_representable_day(client, sales):
+    assert _exported_prices(client, 'start_date=9999-12-31') == []
+
+
+def test_expense_export_rejects_an_invalid_user_id(client):
+    assert client.get('/expenses/export?user_id=abc').status_code == 400
+    assert client.get('/expenses/export?user_id=1').status_code == 200
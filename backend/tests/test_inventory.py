@@ -0,0 +1,38 @@
+from datetime import date, datetime, timedelta
+
+from extensions import db
+from models.products import Product
+from models.sale import Sale
+
+
+def _product_with_sales(stock, units, days_ago=1):
+    product = Product(product_name='Widget', initial_stock=stock, price=10, user_id=1)
+    db.session.add(product)
+    db.session.flush()
+    db.session.add(Sale(product_id=product.id, quantity=units, sale_price=10.0, user_id=1,
+                        sale_date=datetime.now() - timedelta(days=days_ago)))
+    db.session.commit()
+    return product
+
+
+def test_stockout_date_from_sales_velocity(client):
+    _product_with_sales(stock=10, units=28)
+
+    [outlook] = client.get('/stock_level_forecast?window=28').get_json()['products']
+
+    assert outlook['daily_velocity'] == 1
+    assert outlook['days_of_cover'] == 10
+    assert outlook['stockout_date'] == (date.today() + timedelta(days=10)).isoformat()
+    assert outlook['needs_reorder'] is False
+
+
+def test_slow_seller_with_huge_stock_has_no_stockout_date(client):
+    _product_with_sales(stock=200000, units=1)
+
+    response = client.get('/stock_level_forecast?window=28')
+
+    assert response.status_code == 200
+    [outlook] = response.get_json()['products']
+    assert outlook['stockout_date'] is None
+    assert outlook['days_of_cover'] is None
+    assert outlook['needs_reorder'] is False
@@ -0,0 +1,47 @@
+from datetime import datetime, timedelta
+
+from analytics import ledger as ledger_module
+from analytics.ledger import ledgers
+from analytics.periods import date_range_period
+from analytics.rollups import apply_sale
+from extensions import db
+from models.sale import Sale
+
+
+def _all_time():
+    return date_range_period(datetime(2000, 1, 1), datetime.now() + timedelta(days=1))
+
+
+def test_sale_committed_while_the_ledger_loads_is_counted_once(app, product, monkeypatch):
+    committed = []
+    load = ledger_module.UserLedger.__init__
+
+    def load_racing_a_write(self, user_id, version):
+        if not committed:
+            # Another request records a sale after the version was read but before the rows are.
+            sale = Sale(product_id=product.id, quantity=2, sale_price=5.0, user_id=1)
+            db.session.add(sale)
+            db.session.flush()
+            apply_sale(sale)
+            db.session.commit()
+            committed.append(sale)
+        load(self, user_id, version)
+
+    monkeypatch.setattr(ledger_module.UserLedger, '__init__', load_racing_a_write)
+    ledgers.totals(1, _all_time())
+    ledgers.record_sale(committed[0])  # the writer's post-commit append
+
+    assert ledgers.totals(1, _all_time())['sales'] == 10
+
+
+def test_sales_recorded_after_the_load_are_appended(app, product):
+    assert ledgers.totals(1, _all_time())['sales'] == 0
+
+    sale = Sale(product_id=product.id, quantity=3, sale_price=2.0, user_id=1)
+    db.session.add(sale)
+    db.session.flush()
+    apply_sale(sale)
+    db.session.commit()
+    ledgers.record_sale(sale)
+
+    assert ledgers.totals(1, _all_time())['sales'] == 6
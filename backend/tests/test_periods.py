@@ -0,0 +1,25 @@
+from datetime import date
+
+import pytest
+
+from analytics.periods import date_range_period, day_period, iso_week_period, week_period
+
+
+@pytest.mark.parametrize('period', [
+    lambda: day_period(date.max),
+    lambda: date_range_period(date(2025, 1, 1), date.max),
+    lambda: week_period(date.max),
+    lambda: iso_week_period(9999, 52),
+])
+def test_periods_ending_past_date_max_raise_value_error(period):
+    with pytest.raises(ValueError):
+        period()
+
+
+@pytest.mark.parametrize('url', [
+    '/profit_loss/date?start_date=2025-01-01&end_date=9999-12-31',
+    '/taxes/date?user_id=1&tax_rate=10&start_date=2025-01-01&end_date=9999-12-31',
+    '/taxes/time_range?user_id=1&start_date=2025-01-01&end_date=9999-12-31',
+])
+def test_date_range_reports_reject_the_last_representable_day(client, url):
+    assert client.get(url).status_code == 400
@@ -0,0 +1,67 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from extensions import db
+from models.products import Product
+from models.sale import Sale
+from reports.model_registry import model_registry
+from reports.product_performance import train_prediction
+
+
+@pytest.fixture
+def trained(app):
+    products = [Product(product_name=name, initial_stock=100, price=10, user_id=1) for name in ('A', 'B')]
+    db.session.add_all(products)
+    db.session.flush()
+    start = datetime(2024, 1, 1)
+    for day in range(40):
+        product = products[day % 2]
+        db.session.add(Sale(product_id=product.id, quantity=1 + day % 3, sale_price=10.0 + 5 * (day % 2) + day % 3,
+                            user_id=1, sale_date=start + timedelta(days=day)))
+    db.session.commit()
+    model_registry.get('sales_prediction', 1, train_prediction)
+    return products
+
+
+def _row(product, day='2024-02-01', quantity=2):
+    return {'sale_date': day, 'product_id': product.id, 'quantity': quantity}
+
+
+def test_batch_predictions_match_single_row_predictions(client, trained):
+    a, b = trained
+    single = client.post('/predict_sales', json=_row(a)).get_json()['predictions']
+    batch = client.post('/predict_sales', json=[_row(a), _row(b)]).get_json()['predictions']
+
+    assert batch[0] == pytest.approx(single[0])
+
+
+def test_row_missing_a_feature_rejects_the_batch(client, trained):
+    a, b = trained
+    rows = [_row(a), {'sale_date': '2024-02-01', 'quantity': 2}, _row(b)]
+
+    response = client.post('/predict_sales', json=rows)
+
+    assert response.status_code == 400
+    assert [error['row'] for error in response.get_json()['errors']] == [1]
+
+
+def test_batch_without_product_id_column_is_a_bad_request(client):
+    response = client.post('/predict_sales', json=[{'sale_date': '2024-02-01', 'quantity': 2}])
+
+    assert response.status_code == 400
+    assert 'product_id' in response.get_json()['errors'][0]['message']
+
+
+def test_non_finite_and_non_integer_values_are_rejected(client):
+    rows = [
+        {'sale_date': '2024-02-01', 'product_id': 1, 'quantity': 'nan'},
+        {'sale_date': '2024-02-01', 'product_id': 1.5, 'quantity': 2},
+        {'sale_date': 'not a date', 'product_id': 1, 'quantity': 2},
+        {'sale_date': '2024-02-01', 'product_id': 1, 'quantity': 'inf'},
+    ]
+
+    response = client.post('/predict_sales', json=rows)
+
+    assert response.status_code == 400
+    assert [error['row'] for error in response.get_json()['errors']] == [0, 1, 2, 3]
@@ -0,0 +1,22 @@
+import warnings
+from datetime import datetime
+
+import pandas as pd
+
+from reports.product_performance import sales_trend_chart
+
+
+def test_sales_trend_chart_has_one_line_per_product_and_month_labels():
+    df = pd.DataFrame({
+        'product_name': ['A', 'B', 'A'],
+        'quantity': [1, 1, 1],
+        'sale_date': [datetime(2025, 1, 5), datetime(2025, 1, 20), datetime(2025, 2, 3)],
+        'sale_price': [2.0, 3.0, 4.0],
+    })
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('error', FutureWarning)
+        spec = sales_trend_chart(df)
+
+    assert spec['x'] == ['2025-01', '2025-02']
+    assert {series['name']: series['values'] for series in spec['series']} == {'A': [2.0, 4.0], 'B': [3.0, 0.0]}
@@ -0,0 +1,46 @@
+from models.products import Product
+
+
+def _add(client, sku, **fields):
+    return client.post('/products/add', json={
+        'product_name': 'Widget', 'initial_stock': 5, 'price': 10, 'user_id': 1, 'sku': sku, **fields,
+    })
+
+
+def test_duplicate_sku_on_add_is_a_conflict(client, app):
+    assert _add(client, 'W-1').status_code == 201
+
+    assert _add(client, 'W-1').status_code == 409
+    assert _add(client, 'W-2').status_code == 201
+    assert Product.query.count() == 2
+
+
+def test_duplicate_sku_on_update_is_a_conflict(client, app):
+    _add(client, 'W-1')
+    other = _add(client, 'W-2').get_json()
+
+    response = client.put(f"/products/{other['id']}", json={'sku': 'W-1'})
+
+    assert response.status_code == 409
+    assert client.get(f"/products/{other['id']}").get_json()['sku'] == 'W-2'
+
+
+def test_non_finite_price_is_rejected(client, app):
+    assert _add(client, 'W-1', price='nan').status_code == 400
+    other = _add(client, 'W-2').get_json()
+    assert client.put(f"/products/{other['id']}", json={'price': 'inf'}).status_code == 400
+
+
+def test_bulk_rejects_non_finite_and_negative_prices_per_row(client, app):
+    rows = [
+        {'sku': 'A', 'product_name': 'A', 'initial_stock': 1, 'price': 2},
+        {'sku': 'B', 'product_name': 'B', 'initial_stock': 1, 'price': 'nan'},
+        {'sku': 'C', 'product_name': 'C', 'initial_stock': 1, 'price': 'inf'},
+        {'sku': 'D', 'product_name': 'D', 'initial_stock': 1, 'price': -1},
+        {'sku': 'E', 'product_name': 'E', 'initial_stock': 'inf', 'price': 1},
+    ]
+
+    response = client.post('/products/bulk', json=rows)
+
+    assert response.status_code == 200
+    assert [result['status'] for result in response.get_json()['results']] == ['created'] + ['error'] * 4
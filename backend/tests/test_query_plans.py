@@ -0,0 +1,66 @@
+"""
+The hot report and list queries must stay on their (user_id, date) indexes.
+
+Each case runs the real service function or endpoint, captures the SQL it emits and
+checks the EXPLAIN QUERY PLAN of every statement, so a change to a query or an index
+that falls back to a full table scan fails here.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from analytics import service
+from analytics.inventory import units_sold
+from analytics.ledger import ledgers
+from analytics.periods import month_period
+from analytics.query_plans import capture_statements, explain, full_scans, uses_index
+from extensions import db
+from models.sale import Sale
+
+JANUARY = month_period(2025, 1)
+
+
+def _next_page(client, url):
+    cursor = client.get(url + 'limit=1').get_json()['next_cursor']
+    assert cursor
+    client.get(url + f'limit=1&after={cursor}')
+
+
+WORKLOADS = {
+    'totals': lambda client: service.totals(1, period=JANUARY),
+    'all-time totals': lambda client: service.totals(1),
+    'weekly series': lambda client: service.series(1, ('sales', 'expenses', 'profit_loss'), 'week', JANUARY),
+    'comparison': lambda client: service.compare(1, [JANUARY, month_period(2025, 2)]),
+    'product totals': lambda client: service.product_totals(1, period=JANUARY, limit=5),
+    'first day': lambda client: service.first_day(1),
+    'ledger load': lambda client: ledgers.totals(1, JANUARY),
+    'units sold': lambda client: units_sold(1, JANUARY.start_day, JANUARY.end_day),
+    'transactions page': lambda client: _next_page(client, '/transactions?'),
+    'expenses page': lambda client: _next_page(client, '/expenses?user_id=1&'),
+    'taxes page': lambda client: _next_page(client, '/taxes/list?'),
+    'products page': lambda client: client.get('/products'),
+    'stores page': lambda client: client.get('/stores'),
+}
+
+
+@pytest.fixture
+def data(client, product):
+    for day in range(2):
+        db.session.add(Sale(product_id=product.id, quantity=1, sale_price=2.0, user_id=1,
+                            sale_date=datetime(2025, 1, 10) + timedelta(days=day)))
+    db.session.commit()
+    for amount in (5, 6):
+        client.post('/expenses', json={'description': 'Rent', 'amount': amount, 'user_id': 1})
+        client.post('/create-taxes', json={'user_id': 1, 'tax_rate': 10, 'tax_amount': amount})
+
+
+@pytest.mark.parametrize('name', WORKLOADS)
+def test_hot_queries_use_an_index(client, data, name):
+    with capture_statements() as statements:
+        WORKLOADS[name](client)
+    assert statements
+
+    for statement, parameters in statements:
+        plan = explain(statement, parameters)
+        assert not full_scans(plan), f'{name}: {statement}\n{plan}'
+        assert uses_index(plan), f'{name}: {statement}\n{plan}'
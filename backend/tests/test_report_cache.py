@@ -0,0 +1,60 @@
+from extensions import db
+from models.products import Product
+
+
+def _sell(client, product, quantity=2, price=5.0):
+    response = client.post('/transactions/create', json={
+        'product_id': product.id, 'quantity': quantity, 'sale_price': price, 'user_id': 1,
+    })
+    assert response.status_code == 201
+
+
+def test_report_is_fresh_after_a_write(client, product):
+    assert client.get('/profit_loss').get_json()['total_sales'] == 0
+
+    _sell(client, product)
+
+    assert client.get('/profit_loss').get_json()['total_sales'] == 10
+
+
+def test_user_id_parameter_does_not_key_a_view_that_ignores_it(client, product):
+    # /profit_loss always reports the placeholder user, so ?user_id= must not select
+    # another user's data version for the cache key.
+    assert client.get('/profit_loss?user_id=7').get_json()['total_sales'] == 0
+
+    _sell(client, product)
+
+    assert client.get('/profit_loss?user_id=7').get_json()['total_sales'] == 10
+
+
+def test_etag_changes_after_a_write(client, product):
+    first = client.get('/profit_loss')
+    assert client.get('/profit_loss', headers={'If-None-Match': first.headers['ETag']}).status_code == 304
+
+    _sell(client, product)
+
+    response = client.get('/profit_loss', headers={'If-None-Match': first.headers['ETag']})
+    assert response.status_code == 200
+    assert response.get_json()['total_sales'] == 10
+
+
+def test_query_user_view_is_keyed_on_that_user(client):
+    assert client.get('/expenses?user_id=7').get_json()['items'] == []
+
+    response = client.post('/expenses', json={'description': 'Rent', 'amount': 100, 'user_id': 7})
+    assert response.status_code == 201
+
+    assert [expense['amount'] for expense in client.get('/expenses?user_id=7').get_json()['items']] == [100]
+
+
+def test_304_carries_the_etag_of_the_compressed_200(client, app):
+    db.session.add_all([Product(product_name=f'Widget {i}', initial_stock=10, price=10, user_id=1) for i in range(20)])
+    db.session.commit()
+    headers = {'Accept-Encoding': 'gzip'}
+
+    first = client.get('/products', headers=headers)
+    assert first.headers['Content-Encoding'] == 'gzip'
+    revalidated = client.get('/products', headers={**headers, 'If-None-Match': first.headers['ETag']})
+
+    assert revalidated.status_code == 304
+    assert revalidated.headers['ETag'] == first.headers['ETag']
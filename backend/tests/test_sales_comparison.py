@@ -0,0 +1,25 @@
+from datetime import datetime
+
+from analytics.rollups import apply_sale
+from extensions import db
+from models.sale import Sale
+
+
+def test_comparison_across_months(client, product):
+    sale = Sale(product_id=product.id, quantity=2, sale_price=10.0, user_id=1, sale_date=datetime(2025, 2, 3, 12))
+    db.session.add(sale)
+    db.session.flush()
+    apply_sale(sale)
+    db.session.commit()
+
+    response = client.get('/sales/comparison?granularity=month&periods=2025-01,2025-02')
+
+    assert response.status_code == 200
+    periods = response.get_json()['periods']
+    assert [period['sales'] for period in periods] == [0, 20.0]
+    assert periods[1]['change']['sales']['absolute'] == 20.0
+
+
+def test_comparison_rejects_periods_ending_past_the_last_representable_day(client):
+    assert client.get('/sales/comparison?granularity=day&periods=9999-12-31').status_code == 400
+    assert client.get('/sales/comparison?granularity=week&periods=9999-W52').status_code == 400
@@ -0,0 +1,42 @@
+from datetime import date
+
+import pytest
+
+from analytics import service
+from analytics.periods import date_range_period
+
+
+@pytest.mark.parametrize('granularity', service.GRANULARITIES)
+@pytest.mark.parametrize('start, end', [
+    (date(2024, 1, 1), date(2024, 1, 1)),
+    (date(2023, 11, 30), date(2025, 2, 3)),
+    (date(2024, 2, 29), date(2024, 12, 31)),
+])
+def test_bucket_count_matches_the_series(app, granularity, start, end):
+    period = date_range_period(start, end)
+    assert service.bucket_count(granularity, period) == len(service.series(1, ('sales',), granularity, period))
+
+
+def test_series_over_a_short_range(client):
+    response = client.get('/series/sales?start_date=2025-01-01&end_date=2025-01-07')
+
+    assert response.status_code == 200
+    assert len(response.get_json()['x']) == 7
+
+
+def test_series_over_too_many_buckets_is_rejected(client):
+    response = client.get('/series/sales?start_date=0001-01-01&end_date=2025-01-01')
+
+    assert response.status_code == 400
+    assert 'buckets' in response.get_json()['message']
+
+
+def test_coarser_granularity_covers_a_long_range(client):
+    response = client.get('/series/sales?start_date=0001-01-01&end_date=2025-01-01&granularity=year')
+
+    assert response.status_code == 200
+    assert len(response.get_json()['x']) == 2025
+
+
+def test_last_representable_end_date_is_rejected(client):
+    assert client.get('/series/sales?start_date=9999-12-01&end_date=9999-12-31').status_code == 400
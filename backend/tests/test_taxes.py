@@ -0,0 +1,14 @@
+def test_tax_records_are_listed(client, app):
+    for amount in (3, 4, 5):
+        response = client.post('/create-taxes', json={'user_id': 1, 'tax_rate': 10, 'tax_amount': amount})
+        assert response.status_code == 201
+
+    first = client.get('/taxes/list?limit=2').get_json()
+    second = client.get(f"/taxes/list?limit=2&after={first['next_cursor']}").get_json()
+
+    assert [tax['tax_amount'] for tax in first['items'] + second['items']] == [3, 4, 5]
+    assert second['next_cursor'] is None
+
+
+def test_tax_report_still_answers_at_taxes(client, app):
+    assert client.get('/taxes?tax_rate=10').get_json()['total_taxes'] == 0
@@ -0,0 +1,39 @@
+import csv
+import io
+
+from flask import request
+
+MAX_BULK_ROWS = 50000
+
+
+class BulkError(ValueError):
+    pass
+
+
+def read_rows():
+    """
+    The rows of a bulk request as a list of dicts.
+
+    Accepts a JSON array of objects, a CSV body (Content-Type: text/csv) or a CSV upload
+    in the `file` form field; CSV values arrive as strings. Raises BulkError when the body
+    is neither, is empty, or has more than MAX_BULK_ROWS rows.
+    """
+    upload = request.files.get('file')
+    if upload is not None:
+        rows = list(csv.DictReader(io.TextIOWrapper(upload.stream, encoding='utf-8-sig')))
+    elif request.mimetype == 'text/csv':
+        rows = list(csv.DictReader(io.StringIO(request.get_data(as_text=True))))
+    else:
+        rows = request.get_json(silent=True)
+        if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+            raise BulkError('Expected a JSON array of objects or a CSV body')
+
+    if not rows:
+        raise BulkError('No rows provided')
+    if len(rows) > MAX_BULK_ROWS:
+        raise BulkError(f'Too many rows; send at most {MAX_BULK_ROWS} per request')
+    return rows
+
+
+def missing_fields(row, fields):
+    return [field for field in fields if row.get(field) in (None, '')]
@@ -2,6 +2,12 @@ from flask import Blueprint, jsonify, request
 from datetime import datetime
 from models.expense import Expense
 from extensions import db
+from analytics.rollups import apply_expense
+from analytics.ledger import ledgers
+from analytics.cache import conditional_get, query_user_id
+from views.pagination import InvalidCursor
+from views.serialization import InvalidFields, list_response
+from views.exports import EXPORT_FORMATS, export_period, stream_export
 expense_blueprint = Blueprint("expenses", __name__)
 
 
@@ -19,17 +25,43 @@ def create_expense():
         user_id=data['user_id']
     )
     db.session.add(new_expense)
+    db.session.flush()  # populate the date default before rolling it up
+    apply_expense(new_expense)
     db.session.commit()
+    ledgers.record_expense(new_expense)
     return jsonify(new_expense.to_dict()), 201
 
 @expense_blueprint.route('/expenses', methods=['GET'])
+@conditional_get(user=query_user_id)
 def get_expenses():
-    user_id = request.args.get('user_id')
+    user_id = query_user_id()
     if not user_id:
-        return jsonify({'message': 'Missing user_id parameter'}), 400
+        return jsonify({'message': 'Missing or invalid user_id parameter'}), 400
 
-    expenses = Expense.query.filter_by(user_id=user_id).all()
-    return jsonify([expense.to_dict() for expense in expenses])
+    try:
+        return list_response(Expense, [Expense.user_id == user_id], Expense.date, Expense.id)
+    except InvalidCursor:
+        return jsonify({'message': 'Invalid cursor'}), 400
+    except InvalidFields as e:
+        return jsonify({'message': str(e)}), 400
+
+@expense_blueprint.route('/expenses/export', methods=['GET'])
+def export_expenses():
+    user_id = query_user_id()
+    if not user_id:
+        return jsonify({'message': 'Missing or invalid user_id parameter'}), 400
+    export_format = request.args.get('format', 'ndjson')
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({'message': f"Invalid format. Use any of {', '.join(EXPORT_FORMATS)}."}), 400
+    try:
+        criteria = export_period(Expense.date)
+    except ValueError:
+        return jsonify({'message': 'Invalid date format. Use YYYY-MM-DD.'}), 400
+
+    query = db.session.query(
+        Expense.id, Expense.description, Expense.amount, Expense.date, Expense.category, Expense.user_id
+    ).filter(Expense.user_id == user_id, *criteria).order_by(Expense.date, Expense.id)
+    return stream_export(query, 'expenses', export_format)
 
 @expense_blueprint.route('/expenses/<int:expense_id>', methods=['GET'])
 def get_expense(expense_id):
@@ -48,6 +80,7 @@ def update_expense(expense_id):
     if not data:
         return jsonify({'message': 'No data provided'}), 400
 
+    apply_expense(expense, -1)
     if 'description' in data:
         expense.description = data['description']
     if 'amount' in data:
@@ -56,6 +89,7 @@ def update_expense(expense_id):
         expense.category = data['category']
     if 'date' in data:
         expense.date = datetime.fromisoformat(data['date']) #parse iso format date
+    apply_expense(expense)
     db.session.commit()
     return jsonify(expense.to_dict())
 
@@ -65,6 +99,7 @@ def delete_expense(expense_id):
     if not expense:
         return jsonify({'message': 'Expense not found'}), 404
 
+    apply_expense(expense, -1)
     db.session.delete(expense)
     db.session.commit()
     return jsonify({'message': 'Expense deleted'}), 200
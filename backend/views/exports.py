@@ -0,0 +1,76 @@
+import csv
+import io
+import json
+from datetime import datetime
+
+from flask import Response, request, stream_with_context
+
+from analytics.periods import day_period
+
+EXPORT_BATCH_SIZE = 1000
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+
+def _value(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def _ndjson(rows, fields):
+    buffer = []
+    for row in rows:
+        buffer.append(json.dumps({field: _value(value) for field, value in zip(fields, row)}))
+        if len(buffer) >= EXPORT_BATCH_SIZE:
+            yield '\n'.join(buffer) + '\n'
+            buffer = []
+    if buffer:
+        yield '\n'.join(buffer) + '\n'
+
+
+def _csv(rows, fields):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    for count, row in enumerate(rows, start=1):
+        writer.writerow([_value(value) for value in row])
+        if count % EXPORT_BATCH_SIZE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def export_period(date_column):
+    """
+    Optional start_date/end_date (YYYY-MM-DD, inclusive) filters for an export.
+    Returns a list of SQL criteria; raises ValueError on a malformed date.
+    """
+    start_date = request.args.get('start_date')
+    end_date = request.args.get('end_date')
+    criteria = []
+    if start_date:
+        criteria.append(date_column >= datetime.strptime(start_date, '%Y-%m-%d'))
+    if end_date:
+        criteria.append(date_column < day_period(datetime.strptime(end_date, '%Y-%m-%d').date()).end)
+    return criteria
+
+
+def stream_export(query, filename, export_format):
+    """
+    Streams a column-projected query as NDJSON or CSV.
+
+    Rows are pulled from the database in `yield_per` batches and written out as they
+    arrive, so memory stays flat whatever the row count and the first bytes go out
+    as soon as the first batch is read. The query's column labels become the field names.
+    """
+    fields = [column['name'] for column in query.column_descriptions]
+    rows = query.yield_per(EXPORT_BATCH_SIZE)
+    body = _csv(rows, fields) if export_format == 'csv' else _ndjson(rows, fields)
+
+    return Response(
+        stream_with_context(body),
+        mimetype=EXPORT_FORMATS[export_format],
+        headers={'Content-Disposition': f'attachment; filename={filename}.{export_format}'},
+    )
@@ -0,0 +1,64 @@
+import base64
+import json
+from datetime import datetime
+
+from flask import request
+from sqlalchemy import tuple_
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(values):
+    values = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+def decode_cursor(cursor, key_columns):
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if not isinstance(values, list) or len(values) != len(key_columns):
+            raise InvalidCursor(cursor)
+        return [
+            datetime.fromisoformat(value) if column.type.python_type is datetime else int(value)
+            for column, value in zip(key_columns, values)
+        ]
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor(cursor) from e
+
+
+def page_size():
+    limit = request.args.get('limit', DEFAULT_PAGE_SIZE, type=int)
+    return max(1, min(limit, MAX_PAGE_SIZE))
+
+
+def keyset_page(query, *key_columns):
+    """
+    Returns (rows, next_cursor) for one page of `query`, ordered by `key_columns`.
+
+    Pages are selected with a keyset predicate, `(key) > (cursor key)`, instead of OFFSET,
+    so a deep page costs the same index range scan as the first one. The last key column
+    must be unique (the primary key). Reads `limit` and `after` from the query string and
+    raises InvalidCursor for a malformed `after`.
+    """
+    limit = page_size()
+    after = request.args.get('after')
+    if after:
+        values = decode_cursor(after, key_columns)
+        if len(key_columns) == 1:
+            query = query.filter(key_columns[0] > values[0])
+        else:
+            query = query.filter(tuple_(*key_columns) > tuple_(*values))
+
+    # Fetch one extra row to learn whether there is a next page without a COUNT.
+    rows = query.order_by(*key_columns).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor([getattr(last, column.key) for column in key_columns])
@@ -1,8 +1,17 @@
+import math
+
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from sqlalchemy import insert, update
+from sqlalchemy.exc import IntegrityError
 
 from models.products import Product
 from extensions import db
+from views.pagination import InvalidCursor
+from views.serialization import InvalidFields, list_response
+from analytics import versions
+from analytics.cache import conditional_get, current_user_id
+from views.bulk import BulkError, missing_fields, read_rows
 
 
 product_blueprint = Blueprint("product_blueprint", __name__)
@@ -14,28 +23,141 @@ def create_product():
     if not data or 'product_name' not in data or 'initial_stock' not in data or 'price' not in data or 'user_id' not in data:
         return jsonify({'message': 'Missing data'}), 400
 
+    try:
+        price = _price(data['price'])
+    except (TypeError, ValueError) as e:
+        return jsonify({'message': str(e)}), 400
+
     new_product = Product(
         product_name=data['product_name'],
         description=data.get('description'),
         initial_stock=data['initial_stock'],
-        price=data['price'],
+        price=price,
         category=data.get('category'),
+        sku=data.get('sku'),
         user_id=1
     )
     db.session.add(new_product)
-    db.session.commit()
+    try:
+        versions.bump(new_product.user_id)  # flushes the product, so the sku is checked here
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        return jsonify({'message': 'A product with this sku already exists'}), 409
     return jsonify(new_product.to_dict()), 201
 
+PRODUCT_FIELDS = ('product_name', 'description', 'initial_stock', 'price', 'category')
+SKU_LOOKUP_BATCH_SIZE = 500
+
+
+def _price(value):
+    price = float(value)
+    if not math.isfinite(price):
+        raise ValueError('price must be a finite number')
+    if price < 0:
+        raise ValueError('price must not be negative')
+    return price
+
+
+def _product_values(row):
+    values = {}
+    for field in PRODUCT_FIELDS:
+        if row.get(field) in (None, ''):
+            continue
+        if field == 'initial_stock':
+            values[field] = int(row[field])
+        elif field == 'price':
+            values[field] = _price(row[field])
+        else:
+            values[field] = str(row[field])
+    return values
+
+
+def _ids_by_sku(user_id, skus):
+    ids = {}
+    for start in range(0, len(skus), SKU_LOOKUP_BATCH_SIZE):
+        chunk = skus[start:start + SKU_LOOKUP_BATCH_SIZE]
+        ids.update(db.session.query(Product.sku, Product.id).filter(
+            Product.user_id == user_id, Product.sku.in_(chunk)))
+    return ids
+
+
+@product_blueprint.route('/products/bulk', methods=['POST'])
+def bulk_upsert_products():
+    """
+    Creates or updates a batch of products keyed by their external `sku` (JSON array or CSV).
+
+    Existing SKUs get the given fields updated; new SKUs need product_name, initial_stock
+    and price. Lookups, inserts and updates each run as a few batched statements in one
+    transaction. Invalid rows are skipped and reported; the rest are applied. Returns one
+    result per input row, in order.
+    """
+    user_id = 1
+    try:
+        rows = read_rows()
+    except BulkError as e:
+        return jsonify({'message': str(e)}), 400
+
+    results = [None] * len(rows)
+    items = {}
+    for index, row in enumerate(rows):
+        sku = str(row.get('sku') or '').strip()
+        try:
+            if not sku:
+                raise ValueError('Missing sku')
+            if sku in items:
+                raise ValueError('Duplicate sku in request')
+            items[sku] = (index, _product_values(row))
+        except (TypeError, ValueError, OverflowError) as e:
+            results[index] = {'row': index, 'sku': sku or None, 'status': 'error', 'message': str(e)}
+
+    existing = _ids_by_sku(user_id, list(items))
+    inserts, updates = [], []
+    for sku, (index, values) in items.items():
+        if sku in existing:
+            if values:
+                updates.append({'id': existing[sku], **values})
+            results[index] = {'row': index, 'sku': sku, 'status': 'updated', 'id': existing[sku]}
+            continue
+        missing = missing_fields(values, ('product_name', 'initial_stock', 'price'))
+        if missing:
+            results[index] = {'row': index, 'sku': sku, 'status': 'error',
+                              'message': f"Missing {', '.join(missing)}"}
+            continue
+        inserts.append({**values, 'sku': sku, 'user_id': user_id})
+        results[index] = {'row': index, 'sku': sku, 'status': 'created'}
+
+    if updates:
+        db.session.execute(update(Product), updates)  # bulk UPDATE by primary key
+    if inserts:
+        db.session.execute(insert(Product), inserts)
+        created = _ids_by_sku(user_id, [product['sku'] for product in inserts])
+        for result in results:
+            if result['status'] == 'created':
+                result['id'] = created[result['sku']]
+    if updates or inserts:
+        versions.bump(user_id)
+    db.session.commit()
+
+    counts = {status: sum(result['status'] == status for result in results)
+              for status in ('created', 'updated', 'error')}
+    return jsonify({**counts, 'results': results})
+
 @product_blueprint.route('/products', methods=['GET'])
+@conditional_get
 def get_products():
-    user_id = 1
-    products = Product.query.filter_by(user_id=user_id)
-    return jsonify([product.to_dict() for product in products])
+    user_id = current_user_id()
+    try:
+        return list_response(Product, [Product.user_id == user_id], Product.id)
+    except InvalidCursor:
+        return jsonify({'message': 'Invalid cursor'}), 400
+    except InvalidFields as e:
+        return jsonify({'message': str(e)}), 400
 
 @product_blueprint.route('/products/<int:product_id>', methods=['GET'])
 def get_product(product_id):
     user_id = 1
-    product = Product.query.filter_by(user_id=user_id).get(product_id)
+    product = Product.query.filter_by(user_id=user_id, id=product_id).first()
     if not product:
         return jsonify({'message': 'Product not found'}), 404
     return jsonify(product.to_dict())
@@ -44,7 +166,7 @@ def get_product(product_id):
 @product_blueprint.route('/products/<int:product_id>', methods=['PUT'])
 def update_product(product_id):
     user_id = 1
-    product = Product.query.filter_by(user_id=user_id).get(product_id)
+    product = Product.query.filter_by(user_id=user_id, id=product_id).first()
     if not product:
         return jsonify({'message': 'Product not found'}), 404
 
@@ -52,25 +174,37 @@ def update_product(product_id):
     if not data:
         return jsonify({'message': 'No data provided'}), 400
 
+    try:
+        price = _price(data['price']) if 'price' in data else product.price
+    except (TypeError, ValueError) as e:
+        return jsonify({'message': str(e)}), 400
+
     product.product_name = data.get('product_name', product.product_name)
     product.description = data.get('description', product.description)
     product.initial_stock = data.get('initial_stock', product.initial_stock)
-    product.price = data.get('price', product.price)
+    product.price = price
     product.category = data.get('category', product.category)
+    product.sku = data.get('sku', product.sku)
     product.user_id = data.get('user_id', product.user_id)
 
-    db.session.commit()
+    try:
+        versions.bump(user_id)  # flushes the product, so the sku is checked here
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        return jsonify({'message': 'A product with this sku already exists'}), 409
     return jsonify(product.to_dict())
 
 
 @product_blueprint.route('/products/<int:product_id>', methods=['DELETE']) 
 def delete_product(product_id):
     user_id = 1
-    product = Product.query.filter_by(user_id=user_id).get(product_id)
+    product = Product.query.filter_by(user_id=user_id, id=product_id).first()
   
     if not product:
         return jsonify({'message': 'Product not found'}), 404
 
+    versions.bump(user_id)
     db.session.delete(product)
     db.session.commit()
     return jsonify({'message': 'Product deleted'}), 200
@@ -80,7 +214,7 @@ def delete_product(product_id):
 @product_blueprint.route('/products/<int:product_id>/stock', methods=['PUT'])
 def update_stock(product_id):
     user_id = 1
-    product = Product.query.filter_by(user_id=user_id).get(product_id)
+    product = Product.query.filter_by(user_id=user_id, id=product_id).first()
   
     if not product:
         return jsonify({'message': 'Product not found'}), 404
@@ -90,5 +224,6 @@ def update_stock(product_id):
         return jsonify({'message': 'Missing stock data'}), 400
 
     product.initial_stock = data['initial_stock']
+    versions.bump(user_id)
     db.session.commit()
     return jsonify(product.to_dict())
\ No newline at end of file
@@ -1,14 +1,17 @@
 from flask import Blueprint, jsonify, request
 from datetime import datetime
 
-from models.expense import Expense
-from models.sale import Sale
+from analytics.periods import date_range_period
+from analytics import service as analytics
+from analytics.cache import cached_report, current_user_id
+from analytics.ledger import ledgers
 
 profit_loss_blueprint = Blueprint('profit_loss', __name__)
 
 @profit_loss_blueprint.route('/profit_loss', methods=['GET'])
+@cached_report
 def calculate_profit_loss():
-    user_id = 1
+    user_id = current_user_id()
     if not user_id:
         return jsonify({'message': 'Missing user_id parameter'}), 400
 
@@ -17,13 +20,11 @@ def calculate_profit_loss():
     except ValueError:
         return jsonify({'message': 'Invalid user_id format. Must be an integer.'}), 400
 
-    sales = Sale.query.filter_by(user_id=user_id).all()
-    expenses = Expense.query.filter_by(user_id=user_id).all()
+    totals = analytics.totals(user_id, ('sales', 'expenses', 'profit_loss'))
 
-    total_sales = sum(sale.quantity * sale.sale_price for sale in sales)
-    total_expenses = sum(expense.amount for expense in expenses)
-
-    profit_loss = total_sales - total_expenses
+    total_sales = totals['sales']
+    total_expenses = totals['expenses']
+    profit_loss = totals['profit_loss']
 
     return jsonify({
 
@@ -33,8 +34,9 @@ def calculate_profit_loss():
     }), 200
 
 @profit_loss_blueprint.route('/profit_loss/date', methods=['GET'])
+@cached_report
 def calculate_profit_loss_by_date():
-    user_id = 1
+    user_id = current_user_id()
     start_date_str = request.args.get('start_date')
     end_date_str = request.args.get('end_date')
 
@@ -45,16 +47,15 @@ def calculate_profit_loss_by_date():
         user_id = int(user_id)
         start_date = datetime.strptime(start_date_str, '%Y-%m-%d')
         end_date = datetime.strptime(end_date_str, '%Y-%m-%d')
+        period = date_range_period(start_date, end_date)
     except ValueError:
         return jsonify({'message': 'Invalid parameter format'}), 400
 
-    sales = Sale.query.filter(Sale.user_id == user_id, Sale.sale_date >= start_date, Sale.sale_date <= end_date).all()
-    expenses = Expense.query.filter(Expense.user_id == user_id, Expense.date >= start_date, Expense.date <= end_date).all()
-
-    total_sales = sum(sale.quantity * sale.sale_price for sale in sales)
-    total_expenses = sum(expense.amount for expense in expenses)
+    totals = ledgers.totals(user_id, period)
 
-    profit_loss = total_sales - total_expenses
+    total_sales = totals['sales']
+    total_expenses = totals['expenses']
+    profit_loss = totals['profit_loss']
 
     return jsonify({
         'start_date': start_date.strftime('%Y-%m-%d'),
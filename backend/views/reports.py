@@ -1,11 +1,10 @@
 from flask import Blueprint, jsonify, request
-from datetime import datetime, timedelta
-from sqlalchemy import extract, func
-from models.expense import Expense
-from models.sale import Sale
-import pandas as pd
-from models.products import Product    
-from extensions import db
+from datetime import date, datetime
+import numpy as np
+from analytics import service as analytics
+from analytics.cache import cached_report, current_user_id
+from analytics.lttb import lttb
+from analytics.periods import date_range_period, parse_period, week_period, month_period
 
 
 report_blueprint = Blueprint('reports', __name__)
@@ -13,8 +12,9 @@ report_blueprint = Blueprint('reports', __name__)
 
 
 @report_blueprint.route('/reports', methods=['GET'])
+@cached_report
 def get_weekly_sales():
-    user_id = 1
+    user_id = current_user_id()
     if not user_id:
         return jsonify({'message': 'Missing user_id parameter'}), 400
 
@@ -23,31 +23,25 @@ def get_weekly_sales():
     except ValueError:
         return jsonify({'message': 'Invalid user_id format. Must be an integer.'}), 400
 
-    today = datetime.now().date()
-    start_of_week = today - timedelta(days=today.weekday())
-    end_of_week = start_of_week + timedelta(days=6)
+    week = week_period()
+    sales = analytics.totals(user_id, ('sales', 'sale_count'), week)
 
-    sales = Sale.query.filter(
-        Sale.user_id == user_id,
-        func.date(Sale.sale_date) >= start_of_week,
-        func.date(Sale.sale_date) <= end_of_week
-    ).all()
-
-    total_sales = sum(sale.quantity * sale.sale_price for sale in sales)
-    sale_count = len(sales)
+    total_sales = sales['sales']
+    sale_count = sales['sale_count']
 
     return jsonify({
         'user_id': user_id,
-        'start_of_week': start_of_week.isoformat(),
-        'end_of_week': end_of_week.isoformat(),
+        'start_of_week': week.start_day.isoformat(),
+        'end_of_week': week.last_day.isoformat(),
         'total_sales': total_sales,
         'sale_count': sale_count
     }), 200
 
 
 @report_blueprint.route('/sales/monthly', methods=['GET'])
+@cached_report
 def get_monthly_sales():
-    user_id = 1
+    user_id = current_user_id()
     year = request.args.get('year')
     month = request.args.get('month')
 
@@ -61,14 +55,15 @@ def get_monthly_sales():
     except ValueError:
         return jsonify({'message': 'Invalid parameter format'}), 400
 
-    sales = Sale.query.filter(
-        Sale.user_id == user_id,
-        extract('year', Sale.sale_date) == year,
-        extract('month', Sale.sale_date) == month
-    ).all()
+    try:
+        period = month_period(year, month)
+    except ValueError:
+        return jsonify({'message': 'Invalid parameter format'}), 400
+
+    sales = analytics.totals(user_id, ('sales', 'sale_count'), period)
 
-    total_sales = sum(sale.quantity * sale.sale_price for sale in sales)
-    sale_count = len(sales)
+    total_sales = sales['sales']
+    sale_count = sales['sale_count']
 
     return jsonify({
         'user_id': user_id,
@@ -83,8 +78,9 @@ def get_monthly_sales():
 
 
 @report_blueprint.route('/profit_loss/weekly', methods=['GET'])
+@cached_report
 def get_weekly_profit_loss():
-    user_id = 1
+    user_id = current_user_id()
     if not user_id:
         return jsonify({'message': 'Missing user_id parameter'}), 400
 
@@ -93,38 +89,158 @@ def get_weekly_profit_loss():
     except ValueError:
         return jsonify({'message': 'Invalid user_id format. Must be an integer.'}), 400
 
-    today = datetime.now().date()
-    start_of_week = today - timedelta(days=today.weekday())
-    end_of_week = start_of_week + timedelta(days=6)
-
-    sales = Sale.query.filter(
-        Sale.user_id == user_id,
-        func.date(Sale.sale_date) >= start_of_week,
-        func.date(Sale.sale_date) <= end_of_week
-    ).all()
+    week = week_period()
+    totals = analytics.totals(user_id, ('sales', 'expenses', 'profit_loss'), week)
 
-    expenses = Expense.query.filter(
-        Expense.user_id == user_id,
-        func.date(Expense.date) >= start_of_week,
-        func.date(Expense.date) <= end_of_week
-    ).all()
-
-    total_sales = sum(sale.quantity * sale.sale_price for sale in sales)
-    total_expenses = sum(expense.amount for expense in expenses)
-    profit_loss = total_sales - total_expenses
+    total_sales = totals['sales']
+    total_expenses = totals['expenses']
+    profit_loss = totals['profit_loss']
 
     return jsonify({
         'user_id': user_id,
-        'start_of_week': start_of_week.isoformat(),
-        'end_of_week': end_of_week.isoformat(),
+        'start_of_week': week.start_day.isoformat(),
+        'end_of_week': week.last_day.isoformat(),
         'total_sales': total_sales,
         'total_expenses': total_expenses,
         'profit_loss': profit_loss
     }), 200
 
+@report_blueprint.route('/profit_loss/weekly/series', methods=['GET'])
+@cached_report
+def get_weekly_profit_loss_series():
+    """Sales, expenses and profit/loss for every ISO week of a year (defaults to the current one)."""
+    user_id = current_user_id()
+    year = request.args.get('year')
+
+    try:
+        year = int(year) if year else datetime.now().isocalendar()[0]
+    except ValueError:
+        return jsonify({'message': 'Invalid parameter format'}), 400
+
+    if not 1 <= year < 9999:
+        return jsonify({'message': 'Invalid parameter format'}), 400
+
+    return jsonify({
+        'user_id': user_id,
+        'year': year,
+        'weeks': analytics.weekly_profit_loss_series(user_id, year)
+    }), 200
+
+MAX_COMPARISON_PERIODS = 60
+
+@report_blueprint.route('/sales/comparison', methods=['GET'])
+@cached_report
+def get_sales_comparison():
+    """
+    Compares revenue, units and sale count across any number of periods of one granularity.
+
+    Query params: granularity (day/week/month/quarter/year, default month) and periods, a
+    comma separated list such as 2025-01,2025-02 (day YYYY-MM-DD, week YYYY-Www, month
+    YYYY-MM, quarter YYYY-Qn, year YYYY). Each period after the first carries its change
+    from the one before it, absolute and in percent (None when the previous value is 0).
+    """
+    user_id = current_user_id()
+    granularity = request.args.get('granularity', 'month')
+    if granularity not in analytics.GRANULARITIES:
+        return jsonify({'message': f"Invalid granularity. Use any of {', '.join(analytics.GRANULARITIES)}."}), 400
+
+    labels = [label for label in request.args.get('periods', '').split(',') if label.strip()]
+    if not labels:
+        return jsonify({'message': 'Missing periods parameter'}), 400
+    if len(labels) > MAX_COMPARISON_PERIODS:
+        return jsonify({'message': f'Compare at most {MAX_COMPARISON_PERIODS} periods'}), 400
+
+    try:
+        periods = [parse_period(granularity, label) for label in labels]
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+
+    results = []
+    previous = None
+    for label, period, values in zip(labels, periods, analytics.compare(user_id, periods)):
+        result = {
+            'period': label.strip(),
+            'start': period.start_day.isoformat(),
+            'end': period.last_day.isoformat(),
+            **values,
+        }
+        if previous is not None:
+            result['change'] = {
+                metric: {
+                    'absolute': values[metric] - previous[metric],
+                    'percent': round((values[metric] - previous[metric]) / previous[metric] * 100, 2)
+                    if previous[metric] else None,
+                }
+                for metric in ('sales', 'units', 'sale_count')
+            }
+        results.append(result)
+        previous = values
+
+    return jsonify({
+        'user_id': user_id,
+        'granularity': granularity,
+        'periods': results,
+    }), 200
+
+@report_blueprint.route('/series/<metric>', methods=['GET'])
+@cached_report
+def get_metric_series(metric):
+    """
+    One metric (sales, units, sale_count, expenses or profit_loss) as parallel arrays:
+    {'metric', 'granularity', 'x': ['YYYY-MM-DD' bucket starts], 'y': [values]}.
+
+    Query params: granularity (day/week/month/quarter/year, default day), start_date and
+    end_date (YYYY-MM-DD, inclusive; default the user's whole history) and points, which
+    downsamples the series with LTTB to at most that many points so long histories stay
+    a bounded payload.
+    """
+    user_id = current_user_id()
+    if metric not in analytics.METRICS:
+        return jsonify({'message': f"Unknown metric. Use any of {', '.join(analytics.METRICS)}."}), 400
+
+    granularity = request.args.get('granularity', 'day')
+    if granularity not in analytics.GRANULARITIES:
+        return jsonify({'message': f"Invalid granularity. Use any of {', '.join(analytics.GRANULARITIES)}."}), 400
+
+    points = request.args.get('points', type=int)
+    if points is not None and points < 3:
+        return jsonify({'message': 'points must be at least 3'}), 400
+
+    try:
+        start_date = request.args.get('start_date')
+        end_date = request.args.get('end_date')
+        end_date = date.fromisoformat(end_date) if end_date else date.today()
+        start_date = date.fromisoformat(start_date) if start_date else (analytics.first_day(user_id) or end_date)
+    except ValueError:
+        return jsonify({'message': 'Invalid date format. Use YYYY-MM-DD.'}), 400
+    if start_date > end_date:
+        return jsonify({'message': 'start_date must not be after end_date'}), 400
+
+    try:
+        series = analytics.series(user_id, (metric,), granularity, date_range_period(start_date, end_date))
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+    x = [bucket['period_start'] for bucket in series]
+    y = [bucket[metric] for bucket in series]
+
+    if points is not None and points < len(x):
+        days = np.array([date.fromisoformat(day).toordinal() for day in x])
+        keep = lttb(days, y, points)
+        x = [x[i] for i in keep]
+        y = [y[i] for i in keep]
+
+    return jsonify({
+        'user_id': user_id,
+        'metric': metric,
+        'granularity': granularity,
+        'x': x,
+        'y': y,
+    }), 200
+
 @report_blueprint.route('/profit_loss/monthly', methods=['GET'])
+@cached_report
 def get_monthly_profit_loss():
-    user_id = 1
+    user_id = current_user_id()
     year = request.args.get('year')
     month = request.args.get('month')
 
@@ -138,21 +254,16 @@ def get_monthly_profit_loss():
     except ValueError:
         return jsonify({'message': 'Invalid parameter format'}), 400
 
-    sales = Sale.query.filter(
-        Sale.user_id == user_id,
-        extract('year', Sale.sale_date) == year,
-        extract('month', Sale.sale_date) == month
-    ).all()
+    try:
+        period = month_period(year, month)
+    except ValueError:
+        return jsonify({'message': 'Invalid parameter format'}), 400
 
-    expenses = Expense.query.filter(
-        Expense.user_id == user_id,
-        extract('year', Expense.date) == year,
-        extract('month', Expense.date) == month
-    ).all()
+    totals = analytics.totals(user_id, ('sales', 'expenses', 'profit_loss'), period)
 
-    total_sales = sum(sale.quantity * sale.sale_price for sale in sales)
-    total_expenses = sum(expense.amount for expense in expenses)
-    profit_loss = total_sales - total_expenses
+    total_sales = totals['sales']
+    total_expenses = totals['expenses']
+    profit_loss = totals['profit_loss']
 
     return jsonify({
         'user_id': user_id,
@@ -171,40 +282,18 @@ def get_monthly_profit_loss():
 
 
 @report_blueprint.route('/performance')
+@cached_report
 def analyze_sales_performance_orm():
     """
-    Analyzes sales data to identify top and bottom-performing products using SQLAlchemy ORM.
+    Identifies the user's top and bottom-performing products by revenue.
 
     Returns:
-        tuple: A tuple containing two pandas DataFrames:
-            - top_products: DataFrame of top-performing products.
-            - bottom_products: DataFrame of bottom-performing products.
+        dict: 'top_products' and 'bottom_products', each a list of
+            {'product_id', 'product_name', 'total_sales', 'units'}.
     """
     try:
-        # ORM query to join products and sales tables and calculate total sales per product
-        results = db.session.query(
-            Product.product_name,
-            db.func.sum(Sale.sale_price).label('total_sales')
-        ).join(Sale, Product.id == Sale.product_id).group_by(Product.product_name).order_by(db.func.sum(Sale.sale_price).desc()).all()
-
-        # Convert the results to a pandas DataFrame
-        df = pd.DataFrame(results, columns=['product_name', 'total_sales'])
-
-        # Calculate the number of products to include in top and bottom lists (e.g., top 5 and bottom 5)
-        num_products = min(5, len(df))  # Ensure we don't try to slice beyond the DataFrame size
-
-        # Identify top-performing products
-        top_products = df.head(num_products).to_dict(orient='records')
-
-        # Identify bottom-performing products
-        bottom_products = df.tail(num_products).to_dict(orient='records')
-
-        response = {
-            'top_products': top_products,
-            'bottom_products': bottom_products
-        }
-
-        return jsonify(response)
+        user_id = current_user_id()
+        return jsonify(analytics.top_and_bottom_products(user_id))
 
     except Exception as e:
-        return {"msg": f"Error analyzing sales data: {e}"}  # Return empty DataFrames in case of error
+        return {"msg": f"Error analyzing sales data: {e}"}
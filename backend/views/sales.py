@@ -1,16 +1,49 @@
+import math
+from collections import Counter
+from datetime import datetime
+
 from flask import Blueprint, jsonify, request
+from sqlalchemy import bindparam
 
 from models.products import Product
 from models.sale import Sale
 from extensions import db
+from analytics.rollups import apply_sale, apply_sales
+from analytics.ledger import ledgers
+from analytics.cache import conditional_get, current_user_id
+from views.pagination import InvalidCursor
+from views.serialization import InvalidFields, list_response
+from views.exports import EXPORT_FORMATS, export_period, stream_export
+from views.bulk import BulkError, missing_fields, read_rows
 
 sale_blueprint = Blueprint('sales', __name__)
 
 @sale_blueprint.route('/transactions', methods=['GET'])
+@conditional_get
 def get_sales():
-    user_id = 1
-    sales = Sale.query.filter_by(user_id=user_id)
-    return jsonify([sale.to_dict() for sale in sales])
+    user_id = current_user_id()
+    try:
+        return list_response(Sale, [Sale.user_id == user_id], Sale.sale_date, Sale.id)
+    except InvalidCursor:
+        return jsonify({'message': 'Invalid cursor'}), 400
+    except InvalidFields as e:
+        return jsonify({'message': str(e)}), 400
+
+@sale_blueprint.route('/transactions/export', methods=['GET'])
+def export_sales():
+    user_id = current_user_id()
+    export_format = request.args.get('format', 'ndjson')
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({'message': f"Invalid format. Use any of {', '.join(EXPORT_FORMATS)}."}), 400
+    try:
+        criteria = export_period(Sale.sale_date)
+    except ValueError:
+        return jsonify({'message': 'Invalid date format. Use YYYY-MM-DD.'}), 400
+
+    query = db.session.query(
+        Sale.id, Sale.product_id, Sale.quantity, Sale.sale_date, Sale.sale_price, Sale.user_id
+    ).filter(Sale.user_id == user_id, *criteria).order_by(Sale.sale_date, Sale.id)
+    return stream_export(query, 'transactions', export_format)
 
 @sale_blueprint.route('/transactions/<int:sale_id>', methods=['GET'])
 def get_sale(sale_id):
@@ -29,6 +62,7 @@ def update_sale(sale_id):
     if not data:
         return jsonify({'message': 'No data provided'}), 400
 
+    apply_sale(sale, -1)
     if 'product_id' in data:
       sale.product_id = data['product_id']
     if 'quantity' in data:
@@ -37,6 +71,7 @@ def update_sale(sale_id):
       sale.sale_price = data['sale_price']
     if 'user_id' in data:
       sale.user_id = data['user_id']
+    apply_sale(sale)
 
     db.session.commit()
     return jsonify(sale.to_dict())
@@ -47,6 +82,7 @@ def delete_sale(sale_id):
     if not sale:
         return jsonify({'message': 'Sale not found'}), 404
 
+    apply_sale(sale, -1)
     db.session.delete(sale)
     db.session.commit()
     return jsonify({'message': 'Sale deleted'}), 200
@@ -74,5 +110,94 @@ def create_sale():
     product.initial_stock -= data['quantity'] #Reduce the stock.
 
     db.session.add(new_sale)
+    db.session.flush()  # populate the sale_date default before rolling it up
+    apply_sale(new_sale)
+    db.session.commit()
+    ledgers.record_sale(new_sale)
+    return jsonify(new_sale.to_dict()), 201
+
+def _sale_values(row, user_id, now):
+    missing = missing_fields(row, ('product_id', 'quantity', 'sale_price'))
+    if missing:
+        raise ValueError(f"Missing {', '.join(missing)}")
+    quantity = float(row['quantity'])
+    if not math.isfinite(quantity) or quantity != int(quantity):
+        raise ValueError('quantity must be a whole number')
+    if quantity <= 0:
+        raise ValueError('quantity must be positive')
+    sale_price = float(row['sale_price'])
+    if not math.isfinite(sale_price):
+        raise ValueError('sale_price must be a finite number')
+    if sale_price < 0:
+        raise ValueError('sale_price must not be negative')
+    sale_date = row.get('sale_date')
+    return {
+        'product_id': int(row['product_id']),
+        'quantity': int(quantity),
+        'sale_price': sale_price,
+        'sale_date': datetime.fromisoformat(sale_date) if sale_date else now,
+        'user_id': user_id,
+    }
+
+@sale_blueprint.route('/transactions/bulk', methods=['POST'])
+def bulk_create_sales():
+    """
+    Records a batch of sales (JSON array or CSV of product_id, quantity, sale_price and an
+    optional ISO sale_date) in one transaction.
+
+    Stock is checked for every product with one query, decremented with one grouped UPDATE
+    per product and the sales are inserted with a single executemany. The batch is
+    all-or-nothing: if any row is invalid nothing is written and every bad row is reported.
+    Each UPDATE only applies while the stock still covers it, so if a concurrent sale took
+    the stock since it was checked the batch is rolled back with a 409.
+    """
+    user_id = 1
+    try:
+        rows = read_rows()
+    except BulkError as e:
+        return jsonify({'message': str(e)}), 400
+
+    now = datetime.now()
+    sales, errors = [], []
+    for index, row in enumerate(rows):
+        try:
+            sales.append((index, _sale_values(row, user_id, now)))
+        except (TypeError, ValueError, OverflowError) as e:
+            errors.append({'row': index, 'message': str(e)})
+
+    stock = dict(db.session.query(Product.id, Product.initial_stock).filter(
+        Product.user_id == user_id, Product.id.in_({sale['product_id'] for _, sale in sales})).all())
+    for index, sale in sales:
+        product_id = sale['product_id']
+        if product_id not in stock:
+            errors.append({'row': index, 'message': 'Product not found'})
+        elif stock[product_id] < sale['quantity']:
+            errors.append({'row': index, 'message': 'Insufficient stock'})
+        else:
+            stock[product_id] -= sale['quantity']
+
+    if errors:
+        errors.sort(key=lambda error: error['row'])
+        return jsonify({'message': 'No sales were recorded', 'errors': errors}), 400
+
+    sales = [sale for _, sale in sales]
+    sold = Counter()
+    for sale in sales:
+        sold[sale['product_id']] += sale['quantity']
+
+    products = Product.__table__
+    updated = db.session.execute(
+        products.update()
+        .where(products.c.id == bindparam('b_id'), products.c.user_id == user_id,
+               products.c.initial_stock >= bindparam('b_quantity'))
+        .values(initial_stock=products.c.initial_stock - bindparam('b_quantity')),
+        [{'b_id': product_id, 'b_quantity': quantity} for product_id, quantity in sold.items()],
+    )
+    if updated.rowcount != len(sold):
+        db.session.rollback()
+        return jsonify({'message': 'Stock changed while the batch was recorded; no sales were recorded'}), 409
+    db.session.execute(Sale.__table__.insert(), sales)
+    apply_sales(sales)
     db.session.commit()
-    return jsonify(new_sale.to_dict()), 201
\ No newline at end of file
+    ledgers.record_sales(user_id, sales)
+    return jsonify({'message': 'Sales recorded', 'created': len(sales)}), 201
@@ -0,0 +1,49 @@
+import orjson
+from flask import current_app, request
+
+from extensions import db
+from views.pagination import keyset_page
+
+
+class InvalidFields(ValueError):
+    pass
+
+
+def json_response(payload, status=200):
+    """A JSON response encoded with orjson; datetimes come out in ISO 8601, as in `to_dict()`."""
+    return current_app.response_class(orjson.dumps(payload), status=status, mimetype='application/json')
+
+
+def requested_fields(model):
+    """
+    The columns a list response should carry: the comma separated `fields` query parameter,
+    or every column of `model` (the same keys as its `to_dict()`). Raises InvalidFields for
+    names that are not columns.
+    """
+    columns = model.__table__.columns.keys()
+    fields = request.args.get('fields', '')
+    fields = list(dict.fromkeys(field.strip() for field in fields.split(',') if field.strip()))
+    if not fields:
+        return columns
+
+    unknown = [field for field in fields if field not in columns]
+    if unknown:
+        raise InvalidFields(f"Unknown field(s): {', '.join(unknown)}. Use any of {', '.join(columns)}.")
+    return fields
+
+
+def list_response(model, criteria, *key_columns):
+    """
+    One keyset page of `model` rows as {'items': [...], 'next_cursor': ...}.
+
+    Only the requested columns are selected, as plain rows rather than ORM objects, and the
+    page is encoded straight to JSON, so no instances are hydrated and no per-row `to_dict()`
+    copies are made. Raises InvalidFields or InvalidCursor for bad query parameters.
+    """
+    fields = requested_fields(model)
+    # The sort keys are needed for the cursor even when the client did not ask for them.
+    extra = [column for column in key_columns if column.key not in fields]
+    query = db.session.query(*(getattr(model, field) for field in fields), *extra).filter(*criteria)
+
+    rows, next_cursor = keyset_page(query, *key_columns)
+    return json_response({'items': [dict(zip(fields, row)) for row in rows], 'next_cursor': next_cursor})
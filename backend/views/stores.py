@@ -1,6 +1,9 @@
 from flask import Blueprint, jsonify, request
 from extensions import db
 from models.store import Store
+from views.pagination import InvalidCursor
+from views.serialization import InvalidFields, list_response
+from analytics.cache import current_user_id
 
 store_blueprint = Blueprint("stores", __name__)
 
@@ -24,8 +27,13 @@ def create_store():
 
 @store_blueprint.route('/stores', methods=['GET'])
 def get_stores():
-    stores = Store.query.all()
-    return jsonify([store.to_dict() for store in stores])
+    user_id = current_user_id()
+    try:
+        return list_response(Store, [Store.user_id == user_id], Store.id)
+    except InvalidCursor:
+        return jsonify({'message': 'Invalid cursor'}), 400
+    except InvalidFields as e:
+        return jsonify({'message': str(e)}), 400
 
 @store_blueprint.route('/stores/<int:store_id>', methods=['GET'])
 def get_store(store_id):
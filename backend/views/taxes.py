@@ -3,6 +3,10 @@ from datetime import datetime
 
 from models.tax import Tax
 from extensions import db
+from analytics import versions
+from analytics.cache import conditional_get, current_user_id
+from views.pagination import InvalidCursor
+from views.serialization import InvalidFields, list_response
 
 tax_storage_blueprint = Blueprint('tax_storage', __name__)
 
@@ -19,17 +23,24 @@ def create_tax():
         description=data.get('description')
     )
     db.session.add(new_tax)
+    versions.bump(new_tax.user_id)
     db.session.commit()
     return jsonify(new_tax.to_dict()), 201
 
-@tax_storage_blueprint.route('/taxes', methods=['GET'])
+# GET /taxes is the tax calculation report (views/calculates_taxes.py), registered first.
+@tax_storage_blueprint.route('/taxes/list', methods=['GET'])
+@conditional_get
 def get_taxes():
-    user_id = 1
+    user_id = current_user_id()
     if not user_id:
         return jsonify({'message': 'Missing user_id parameter'}), 400
 
-    taxes = Tax.query.filter_by(user_id=user_id).all()
-    return jsonify([tax.to_dict() for tax in taxes])
+    try:
+        return list_response(Tax, [Tax.user_id == user_id], Tax.tax_date, Tax.id)
+    except InvalidCursor:
+        return jsonify({'message': 'Invalid cursor'}), 400
+    except InvalidFields as e:
+        return jsonify({'message': str(e)}), 400
 
 @tax_storage_blueprint.route('/taxes/<int:tax_id>', methods=['GET'])
 def get_tax(tax_id):
@@ -57,6 +68,7 @@ def update_tax(tax_id):
     if 'tax_date' in data:
         tax.tax_date = datetime.fromisoformat(data['tax_date'])
 
+    versions.bump(tax.user_id)
     db.session.commit()
     return jsonify(tax.to_dict())
 
@@ -66,6 +78,7 @@ def delete_tax(tax_id):
     if not tax:
         return jsonify({'message': 'Tax record not found'}), 404
 
+    versions.bump(tax.user_id)
     db.session.delete(tax)
     db.session.commit()
     return jsonify({'message': 'Tax record deleted'}), 200
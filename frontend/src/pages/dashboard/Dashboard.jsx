@@ -23,6 +23,19 @@ import {
   ResponsiveContainer,
 } from "recharts";
 
+// List endpoints return one keyset page, {items, next_cursor}; follow the cursor to the end.
+const fetchAllPages = async (url) => {
+  const items = [];
+  let after = null;
+  do {
+    const pageUrl = after ? `${url}&after=${encodeURIComponent(after)}` : url;
+    const page = await (await fetch(pageUrl)).json();
+    items.push(...page.items);
+    after = page.next_cursor;
+  } while (after);
+  return items;
+};
+
 const Dashboard = () => {
   const navigate = useNavigate();
   const [isSidebarOpen, setIsSidebarOpen] = useState(true);
@@ -67,18 +80,18 @@ const Dashboard = () => {
         //   fetch('/api/reports', { headers }),
         // ]);
 
-        const [ transactionsRes, productsRes, taxesRes, reportsRes] =
+        const [ transactionsRes, productItems, taxesRes, reportsRes] =
           await Promise.all([
             
             fetch("/transactions.json"),
-            fetch("/api/products"),
+            fetchAllPages("/api/products?limit=500"),
             fetch("/taxes.json"),
             fetch("/reports.json"),
           ]);
 
         
         setTransactions(await transactionsRes.json());
-        setProducts(await productsRes.json());
+        setProducts(productItems);
         setTaxes(await taxesRes.json());
         setReports(await reportsRes.json());
       } catch (error) {